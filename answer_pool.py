@@ -0,0 +1,273 @@
+import os
+import time
+import threading
+import contextlib
+import metrics
+from code_class import Code, DIGIT_CHARS
+from answer_source_class import AnswerSource, AnswerSourceError, ApiAnswerSource
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+#file the pool's unused digits are kept in between runs, next to this module
+ANSWER_POOL_PATH=os.path.join(os.path.dirname(os.path.abspath(__file__)), "answer_pool.txt")
+
+#lock file next to the pool file, flock()ed around every read-modify-write of the pool so concurrent games (separate
+#processes) never hand out the same digits or overwrite each other's copy. without fcntl (windows) only threads are locked
+ANSWER_POOL_LOCK_SUFFIX=".lock"
+
+#env variable that turns the pool off ("0"), so every game fetches its own answer from the RNG API
+ANSWER_POOL_ENV_VAR="MASTERMIND_ANSWER_POOL"
+
+#digits requested from the RNG API per refill (the API allows up to 10,000 per request): enough for 400 "hardest"
+#answers. a background refill starts when fewer than POOL_LOW_WATERMARK digits are left (30+ games of any difficulty)
+POOL_FETCH_DIGITS=2400
+POOL_LOW_WATERMARK=200
+
+#a refill request (including its retries) gives up after this many seconds, and after a failed refill the next one waits this long
+POOL_FETCH_DEADLINE=10.0
+POOL_RETRY_DELAY=30.0
+
+#process wide pool, created by get_answer_pool() on first use
+ANSWER_POOL = None
+
+
+class AnswerPool(AnswerSource):
+
+    """
+
+    pool of random digits (0-7) fetched from the RNG API in bulk and stored on disk. every game takes the digits of
+    its answer off the front of the pool, so one API request serves hundreds of games, and whenever the pool runs low
+    a background thread fetches another batch so starting a game never waits on the network. taken digits are removed
+    from the file right away, and every take and refill re-reads the file under an flock() of its lock file, so an
+    answer is never handed out twice, even across runs or by games running side by side
+
+    """
+
+    name = "pool"
+
+    def __init__(self, path: str=ANSWER_POOL_PATH, fetch_digits: int=POOL_FETCH_DIGITS, low_watermark: int=POOL_LOW_WATERMARK):
+        self.path: str = path
+        self.fetch_digits: int = fetch_digits
+        self.low_watermark: int = low_watermark
+        self.lock_path: str = path + ANSWER_POOL_LOCK_SUFFIX
+        self.digits: str | None = None
+        self.lock = threading.Lock()
+        self.refill_thread: threading.Thread | None = None
+        self.retry_at: float = 0.0
+        self.last_error: BaseException | None = None
+
+    @contextlib.contextmanager
+    def locked(self):
+
+        """
+
+        this function holds self.lock and an exclusive flock() of the pool's lock file for the duration of a with
+        block, then reloads the pool from disk, so the block sees (and save()s over) the latest digits of every process
+
+        Example Arg(s):
+            None
+        Example Return:
+            None (a context manager)
+
+        """
+
+        with self.lock:
+            lock_file = None
+            if fcntl is not None:
+                try:
+                    lock_file = open(self.lock_path, "a")
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                except OSError:
+                    lock_file = None
+            try:
+                self.load()
+                yield
+            finally:
+                if lock_file is not None:
+                    lock_file.close()
+
+    def load(self) -> None:
+
+        """
+
+        this function reads the pool's digits from disk (a missing file is an empty pool). must hold self.lock
+
+        Example Arg(s):
+            None
+        Example Return:
+            None
+
+        """
+
+        try:
+            with open(self.path) as f:
+                self.digits = "".join(char for char in f.read() if char in DIGIT_CHARS)
+        except OSError:
+            self.digits = ""
+
+    def save(self) -> None:
+
+        """
+
+        this function rewrites the pool file atomically (temporary file, then rename). must be inside locked(). raises
+        OSError when the file can't be written, leaving the file as it was
+
+        Example Arg(s):
+            None
+        Example Return:
+            None
+
+        """
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.digits)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        with self.lock:
+            self.load()
+            return len(self.digits)
+
+    def ready(self, digit_count: int) -> bool:
+        return len(self) >= digit_count
+
+    def take(self, n: int, digit_count: int) -> list[Code]:
+
+        """
+
+        this function takes the next n * digit_count digits off the pool as n answers, raising AnswerSourceError when
+        the pool doesn't have enough left or the pool file can't be rewritten without them (they would be handed out
+        again). either way it starts a background refill if the pool is low
+
+        Example Arg(s):
+            1, 4 (int, int)
+        Example Return:
+            [Code('1234')] (list[Code])
+
+        """
+
+        with self.locked():
+            taken = None
+            save_error = None
+            if len(self.digits) >= n * digit_count:
+                taken = self.digits[:n * digit_count]
+                self.digits = self.digits[n * digit_count:]
+                try:
+                    self.save()
+                except OSError as e:
+                    #the digits are still in the file, handing them out now would hand them out again next time
+                    taken, save_error = None, e
+            low = len(self.digits) < self.low_watermark
+
+        metrics.ANSWER_POOL_TAKES.inc(result="hit" if taken is not None else "miss")
+        if low:
+            self.start_refill()
+        if save_error is not None:
+            raise AnswerSourceError(f"answer pool file could not be updated: {save_error}") from save_error
+        if taken is None:
+            raise AnswerSourceError(f"answer pool has fewer than {n * digit_count} digits left")
+        return [Code.from_str(taken[idx:idx + digit_count]) for idx in range(0, len(taken), digit_count)]
+
+    def start_refill(self) -> bool:
+
+        """
+
+        this function starts a background refill unless one is already running or the last one failed less than
+        POOL_RETRY_DELAY seconds ago, and returns whether it started one
+
+        Example Arg(s):
+            None
+        Example Return:
+            True (bool)
+
+        """
+
+        with self.lock:
+            if (self.refill_thread is not None and self.refill_thread.is_alive()) or time.monotonic() < self.retry_at:
+                return False
+            self.refill_thread = threading.Thread(target=self.refill, daemon=True)
+            self.refill_thread.start()
+            return True
+
+    def refill(self) -> None:
+
+        """
+
+        this function fetches POOL_FETCH_DIGITS digits from the RNG API and appends them to the pool. a failure is
+        kept in last_error and delays the next refill by POOL_RETRY_DELAY seconds
+
+        Example Arg(s):
+            None
+        Example Return:
+            None
+
+        """
+
+        try:
+            self.add(self.fetch())
+        except Exception as e:
+            with self.lock:
+                self.last_error = e
+                self.retry_at = time.monotonic() + POOL_RETRY_DELAY
+            return
+
+        with self.lock:
+            self.last_error = None
+
+    def add(self, digits: str) -> None:
+
+        """
+
+        this function appends digits to the end of the pool, on disk
+
+        Example Arg(s):
+            "40127735" (str)
+        Example Return:
+            None
+
+        """
+
+        with self.locked():
+            self.digits += digits
+            self.save()
+
+    def fetch(self) -> str:
+
+        """
+
+        this function requests a batch of fetch_digits digits from the RNG API (ApiAnswerSource, with retries and a
+        deadline) and returns them as one string. raises ValueError for a malformed response
+
+        Example Arg(s):
+            None
+        Example Return:
+            "40127735..." (str)
+
+        """
+
+        return ApiAnswerSource(deadline=POOL_FETCH_DEADLINE).fetch_digits(self.fetch_digits)
+
+
+def get_answer_pool() -> AnswerPool | None:
+
+    """
+
+    this function returns the process wide answer pool, or None when ANSWER_POOL_ENV_VAR turns the pool off
+
+    Example Arg(s):
+        None
+    Example Return:
+        <AnswerPool> (AnswerPool | None)
+
+    """
+
+    global ANSWER_POOL
+    if os.environ.get(ANSWER_POOL_ENV_VAR, "1") in ["0", "false", "no"]:
+        return None
+    if ANSWER_POOL is None:
+        ANSWER_POOL = AnswerPool()
+    return ANSWER_POOL
@@ -0,0 +1,202 @@
+import os
+import random
+from code_class import Code, DIGIT_CHARS
+from entropy_class import ENTROPY
+from rng_client import get_with_retries, REQUEST_DEADLINE
+from rng_config import load_rng_config
+
+#env variable picking where the game's answers come from, one of ANSWER_SOURCES: the prefetched pool backed by the RNG
+#API (default), the RNG API per game, the operating system's CSPRNG or a (seedable) PRNG
+ANSWER_SOURCE_ENV_VAR="MASTERMIND_ANSWER_SOURCE"
+ANSWER_SOURCES=["pool", "api", "urandom", "prng"]
+
+#most numbers the RNG API hands out per request, bigger requests are split into several of at most this many
+MAX_NUMBERS_PER_REQUEST=10_000
+
+
+class AnswerSourceError(Exception):
+
+    """
+
+    raised by AnswerSource.take() when a source has no answers to give right now (e.g. an empty pool). errors of the
+    network or the RNG API itself are raised as they are
+
+    """
+
+
+class AnswerSource:
+
+    """
+
+    where answers come from. every backend hands out n answers of digit_count digits per take() call, so a caller that
+    needs many (a pool, a simulation, a benchmark) pays the backend's per call cost once, and tells through ready()
+    whether take() would return without waiting on the network
+
+    """
+
+    name = "source"
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+    def take(self, n: int, digit_count: int) -> list[Code]:
+
+        """
+
+        this function returns n random answers of digit_count digits each, raising AnswerSourceError (or the error of
+        the backend) when it can't
+
+        Example Arg(s):
+            2, 4 (int, int)
+        Example Return:
+            [Code('1234'), Code('7701')] (list[Code])
+
+        """
+
+        raise NotImplementedError
+
+    def ready(self, digit_count: int) -> bool:
+        return True
+
+
+class ApiAnswerSource(AnswerSource):
+
+    """
+
+    answers from the RNG API (the configured url and per difficulty parameters, see rng_config.py), all n of them in
+    as few requests as the API's per request limit allows, through rng_client.py (shared keep-alive session, retries,
+    deadline, circuit breaker)
+
+    """
+
+    name = "api"
+
+    def __init__(self, deadline: float=REQUEST_DEADLINE):
+        self.deadline: float = deadline
+
+    def take(self, n: int, digit_count: int) -> list[Code]:
+        digits = self.fetch_digits(n * digit_count, difficulty=digit_count - 4)
+        return [Code.from_str(digits[idx:idx + digit_count]) for idx in range(0, len(digits), digit_count)]
+
+    def ready(self, digit_count: int) -> bool:
+        return False
+
+    def fetch_digits(self, count: int, difficulty: int=0) -> str:
+
+        """
+
+        this function requests count digits between 0-7 from the RNG API with a difficulty's parameters ("num" set to
+        count, split over requests of at most MAX_NUMBERS_PER_REQUEST numbers, each with its own deadline) and returns
+        them as one string. raises ValueError for a malformed response
+
+        Example Arg(s):
+            8, 0 (int, int)
+        Example Return:
+            "40127735" (str)
+
+        """
+
+        rng_config = load_rng_config()
+        chunks = []
+        for start in range(0, count, MAX_NUMBERS_PER_REQUEST):
+            num = min(MAX_NUMBERS_PER_REQUEST, count - start)
+            params = dict(rng_config["params"].get(difficulty, rng_config["params"][0]), num=num, min=0, max=7)
+            body = get_with_retries(rng_config["url"], params, deadline=self.deadline)
+            digits = body.split()
+            if len(digits) != num or any(digit not in DIGIT_CHARS for digit in digits):
+                raise ValueError(f"malformed RNG API response: {body[:80]!r}")
+            chunks.append("".join(digits))
+        return "".join(chunks)
+
+
+class UrandomAnswerSource(AnswerSource):
+
+    """
+
+    answers from the operating system's CSPRNG, through the process wide entropy buffer (entropy_class.py): a single
+    answer is sliced off a buffered block, a batch is read and sliced into codes in one go. unpredictable, and never
+    touches the network
+
+    """
+
+    name = "urandom"
+
+    def take(self, n: int, digit_count: int) -> list[Code]:
+        if n == 1:
+            return [Code.from_index(ENTROPY.randrange(8 ** digit_count), digit_count)]
+        return ENTROPY.codes(n, digit_count)
+
+
+class PrngAnswerSource(AnswerSource):
+
+    """
+
+    answers from a pseudo random generator: python's random module by default, or a seeded random.Random / GameRNG
+    (rng_class.py) when the answers have to be repeatable. the cheapest source, for anything but predictable answers
+
+    """
+
+    name = "prng"
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def take(self, n: int, digit_count: int) -> list[Code]:
+        code_space = 8 ** digit_count
+        return [Code.from_index(self.rng.randrange(code_space), digit_count) for _ in range(n)]
+
+
+class FallbackAnswerSource(AnswerSource):
+
+    """
+
+    tries its sources in order and returns the answers of the first one that has them, raising the last error when
+    none does (e.g. the pool, then the RNG API). it is ready when its first source is
+
+    """
+
+    def __init__(self, sources: list[AnswerSource]):
+        self.sources: list[AnswerSource] = sources
+        self.name: str = "+".join(source.name for source in sources)
+
+    def take(self, n: int, digit_count: int) -> list[Code]:
+        error = AnswerSourceError("no answer sources")
+        for source in self.sources:
+            try:
+                return source.take(n, digit_count)
+            except Exception as e:
+                error = e
+        raise error
+
+    def ready(self, digit_count: int) -> bool:
+        return self.sources[0].ready(digit_count)
+
+
+def get_answer_source(name: str | None=None) -> AnswerSource:
+
+    """
+
+    this function builds the answer source called name (one of ANSWER_SOURCES), ANSWER_SOURCE_ENV_VAR's value when
+    name is None. "pool" is the prefetched answer pool falling back to the RNG API, or the RNG API alone when the
+    pool is turned off (answer_pool.py). raises ValueError for an unknown name
+
+    Example Arg(s):
+        "urandom" (str | None)
+    Example Return:
+        <UrandomAnswerSource urandom> (AnswerSource)
+
+    """
+
+    from answer_pool import get_answer_pool
+
+    name = name or os.environ.get(ANSWER_SOURCE_ENV_VAR) or ANSWER_SOURCES[0]
+    if name == "pool":
+        answer_pool = get_answer_pool()
+        return FallbackAnswerSource([answer_pool, ApiAnswerSource()]) if answer_pool is not None else ApiAnswerSource()
+    if name == "api":
+        return ApiAnswerSource()
+    if name == "urandom":
+        return UrandomAnswerSource()
+    if name == "prng":
+        return PrngAnswerSource()
+    raise ValueError(f"unknown answer source {name!r}, expected one of {ANSWER_SOURCES}")
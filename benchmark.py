@@ -0,0 +1,277 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+
+import rng_config
+import answer_pool
+from answer_pool import AnswerPool
+from answer_source_class import ApiAnswerSource, UrandomAnswerSource, PrngAnswerSource, ANSWER_SOURCES, get_answer_source
+from game_class import Game
+from hint_class import Hint
+from engine_class import GameEngine, NUM_UNIQUE_HINT_TEMPLATES, DIFFICULTY_NAMES
+from rng_stub import start_stub_rng_server
+
+#file results are written to, and the baseline they are compared against, by default
+BENCH_OUTPUT_PATH="bench_results.json"
+BENCH_BASELINE_PATH="bench_baseline.json"
+
+#a benchmark counts as a regression when it is this many times slower than its baseline
+REGRESSION_THRESHOLD=1.25
+
+#each benchmark runs its function in a loop for at least this long per repeat, and reports the fastest repeat
+MIN_REPEAT_SECONDS=0.05
+REPEATS=5
+
+#answer source comparison: answers per take() call, digits per answer ("hardest"), and calls timed per backend and
+#batch size (each call timed on its own, for its latency percentiles)
+ANSWER_SOURCE_BATCHES=[1, 100]
+ANSWER_SOURCE_DIGITS=6
+ANSWER_SOURCE_CALLS=200
+ANSWER_SOURCE_PERCENTILES=[50, 99]
+
+
+def make_bench_game(difficulty: int) -> Game:
+
+    """
+
+    this function builds a Game ready to play at a difficulty without running its interactive loop (Game.__init__
+    would start the welcome animation and prompt for input), so its methods can be timed directly
+
+    Example Arg(s):
+        0 (int)
+    Example Return:
+        <Game> (Game)
+
+    """
+
+    game = Game.__new__(Game)
+    game.show_ans = False
+    game.answer_source = PrngAnswerSource()
+    game.offline_source = PrngAnswerSource()
+    game.pending_answers = {}
+    game.score = 0
+    game.difficulty = difficulty
+    game.engine = GameEngine(track_candidates=False)
+    game.engine.new_game(difficulty)
+    return game
+
+
+def time_call(func, *args, prepare=None) -> float:
+
+    """
+
+    this function returns the fastest per call time of func(*args), in nanoseconds, over REPEATS repeats of a loop
+    that is sized to run for at least MIN_REPEAT_SECONDS. prepare(loops), when given, runs before every loop outside
+    the timing, e.g. to top up whatever the next loops calls of func consume
+
+    Example Arg(s):
+        <function>, "1234" (Callable, Any)
+    Example Return:
+        1843.2 (float)
+
+    """
+
+    loops = 1
+    while True:
+        if prepare is not None:
+            prepare(loops)
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            func(*args)
+        elapsed = time.perf_counter_ns() - started
+        if elapsed >= MIN_REPEAT_SECONDS * 1e9:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(REPEATS - 1):
+        if prepare is not None:
+            prepare(loops)
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            func(*args)
+        best = min(best, (time.perf_counter_ns() - started) / loops)
+    return best
+
+
+def run_benchmarks(rng_url: str) -> dict[str, float]:
+
+    """
+
+    this function times every hot path of the game at every difficulty and returns {benchmark name: ns per call}
+
+    Example Arg(s):
+        "http://127.0.0.1:53211/integers/" (str)
+    Example Return:
+        {"hard/generate_guess_feedback": 1843.2, ...} (dict[str, float])
+
+    """
+
+    rng_config.load_rng_config()["url"] = rng_url
+    #a pool in a scratch file that never refills itself, topped up by top_up_pool() before each timed loop
+    pool = answer_pool.ANSWER_POOL = AnswerPool(path=os.path.join(tempfile.mkdtemp(), "answer_pool.txt"), low_watermark=0)
+    results = {}
+
+    for difficulty, name in DIFFICULTY_NAMES.items():
+        game = make_bench_game(difficulty)
+        guess_str = "0123456"[:game.engine.digit_count]
+        guess = game.engine.parse_guess(guess_str)
+
+        results[f"{name}/generate_guess_feedback"] = time_call(game.generate_guess_feedback, guess)
+        results[f"{name}/validate_guess"] = time_call(game.validate_guess, guess_str)
+        results[f"{name}/validate_guess[keyword]"] = time_call(game.validate_guess, "/hint")
+        for hint_num in range(NUM_UNIQUE_HINT_TEMPLATES):
+            results[f"{name}/Hint.make_hint[{hint_num}]"] = time_call(Hint(game.engine.ans, hint_num).make_hint)
+        results[f"{name}/generate_hints"] = time_call(game.engine.generate_hints)
+
+        def top_up_pool(loops: int):
+            missing = loops * game.engine.digit_count - len(pool)
+            if missing > 0:
+                pool.add("01234567" * (missing // 8 + 1))
+
+        game.answer_source = get_answer_source("pool")
+        results[f"{name}/fetch_answer"] = time_call(game.fetch_answer, prepare=top_up_pool)
+        game.answer_source = ApiAnswerSource()
+        results[f"{name}/fetch_answer[no pool]"] = time_call(game.fetch_answer)
+
+    return results
+
+
+def compare_answer_sources() -> list[dict]:
+
+    """
+
+    this function times take() of every answer source backend (the API against whatever url load_rng_config() holds,
+    a scratch pool kept topped up outside the timed calls) at every batch size, and returns one row per backend and
+    batch size with its answers per second and per call latency percentiles (ns)
+
+    Example Arg(s):
+        None
+    Example Return:
+        [{"source": "urandom", "batch": 1, "answers_per_s": 410000.0, "p50_ns": 2100, "p99_ns": 4800}, ...] (list[dict])
+
+    """
+
+    pool = AnswerPool(path=os.path.join(tempfile.mkdtemp(), "answer_pool.txt"), fetch_digits=0, low_watermark=0)
+    full_pool = "01234567" * (ANSWER_SOURCE_DIGITS * max(ANSWER_SOURCE_BATCHES) // 8 + 1)
+    sources = {"pool": pool, "api": ApiAnswerSource(), "urandom": UrandomAnswerSource(), "prng": PrngAnswerSource(random.Random(0))}
+    rows = []
+    for name in ANSWER_SOURCES:
+        source = sources[name]
+        for batch in ANSWER_SOURCE_BATCHES:
+            latencies = []
+            for _ in range(ANSWER_SOURCE_CALLS):
+                if name == "pool" and len(pool) < batch * ANSWER_SOURCE_DIGITS:
+                    pool.add(full_pool)
+                started = time.perf_counter_ns()
+                source.take(batch, ANSWER_SOURCE_DIGITS)
+                latencies.append(time.perf_counter_ns() - started)
+            latencies.sort()
+            row = {"source": name, "batch": batch, "answers_per_s": batch * len(latencies) * 1e9 / sum(latencies)}
+            for percent in ANSWER_SOURCE_PERCENTILES:
+                row[f"p{percent}_ns"] = latencies[min(len(latencies) - 1, int(percent / 100 * len(latencies)))]
+            rows.append(row)
+    return rows
+
+
+def format_answer_source_table(rows: list[dict]) -> str:
+
+    """
+
+    this function formats compare_answer_sources() rows as a table, one backend and batch size per row
+
+    Example Arg(s):
+        [{"source": "urandom", "batch": 1, "answers_per_s": 410000.0, "p50_ns": 2100, "p99_ns": 4800}] (list[dict])
+    Example Return:
+        "source      batch   answers/s   p50 us   p99 us\nurandom         1     410,000      2.1      4.8" (str)
+
+    """
+
+    lines = [f"{'source':<10}{'batch':>7}{'answers/s':>14}" + "".join(f"{f'p{p} us':>11}" for p in ANSWER_SOURCE_PERCENTILES)]
+    for row in rows:
+        lines.append(f"{row['source']:<10}{row['batch']:>7}{row['answers_per_s']:>14,.0f}"
+                     + "".join(f"{row[f'p{p}_ns'] / 1e3:>11.1f}" for p in ANSWER_SOURCE_PERCENTILES))
+    return "\n".join(lines)
+
+
+def compare_to_baseline(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+
+    """
+
+    this function prints every benchmark next to its baseline and returns the names of the ones that are more
+    than threshold times slower
+
+    Example Arg(s):
+        {"hard/validate_guess": 2100.0}, {"hard/validate_guess": 1500.0}, 1.25 (dict, dict, float)
+    Example Return:
+        ["hard/validate_guess"] (list[str])
+
+    """
+
+    regressions = []
+    for name, ns in results.items():
+        if name not in baseline:
+            sys.stdout.write(f"{name:<40} {ns:>14,.0f} ns   (no baseline)\n")
+            continue
+        ratio = ns / baseline[name]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        if flag:
+            regressions.append(name)
+        sys.stdout.write(f"{name:<40} {ns:>14,.0f} ns   {ratio:5.2f}x baseline{flag}\n")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="time the game's hot paths per difficulty and compare them to a stored baseline")
+    parser.add_argument("--output", default=BENCH_OUTPUT_PATH, help="file to write the results to (JSON)")
+    parser.add_argument("--baseline", default=BENCH_BASELINE_PATH, help="baseline results to compare against (JSON)")
+    parser.add_argument("--save-baseline", action="store_true", help="also store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="slowdown ratio reported as a regression")
+    parser.add_argument("--answer-sources", action="store_true", help="instead, compare answers/s and latency of every answer source backend")
+    parser.add_argument("--rng-url", help="RNG API the api backend is compared against (default: a local stub, so no network latency)")
+    args = parser.parse_args()
+
+    if args.answer_sources:
+        server = start_stub_rng_server() if not args.rng_url else None
+        rng_config.load_rng_config()["url"] = args.rng_url or f"http://127.0.0.1:{server.server_address[1]}/integers/"
+        try:
+            sys.stdout.write(format_answer_source_table(compare_answer_sources()) + "\n")
+        finally:
+            if server is not None:
+                server.shutdown()
+        sys.exit(0)
+
+    server = start_stub_rng_server()
+    try:
+        results = run_benchmarks(f"http://127.0.0.1:{server.server_address[1]}/integers/")
+    finally:
+        server.shutdown()
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    except (OSError, ValueError, KeyError) as e:
+        sys.stderr.write(f"WARNING: no usable baseline at {args.baseline} ({e}), nothing can be flagged as a regression. "
+                         f"run with --save-baseline on a known good tree to store one\n")
+        compare_to_baseline(results, {}, args.threshold)
+        sys.exit(2)
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        sys.stdout.write(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}x\n")
+        sys.exit(1)
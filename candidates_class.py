@@ -0,0 +1,136 @@
+import hashlib
+import numpy as np
+from feedback_class import get_engine, NUM_DIGIT_VALUES
+
+
+class CandidateSet:
+
+    """
+
+    the set of answers that are still consistent with every feedback a game has given so far. the set starts as
+    the whole code space without allocating anything (idxs is None) and, after each scored guess, is narrowed by
+    filtering only the survivors of the previous turn. survivors are kept as a sorted array of code indices in the
+    smallest unsigned dtype that fits the code space (uint16 up to 5 digits, uint32 for 6), so a session's set costs
+    at most 2-4 bytes per remaining candidate
+
+    """
+
+    def __init__(self, digit_count: int):
+        self.digit_count: int = digit_count
+        self.num_codes: int = NUM_DIGIT_VALUES ** digit_count
+        self.dtype = np.uint16 if self.num_codes <= 2**16 else np.uint32
+        self.idxs: np.ndarray | None = None
+        self.cached_fingerprint: bytes | None = None
+
+    def __len__(self) -> int:
+        return self.num_codes if self.idxs is None else len(self.idxs)
+
+    def update(self, guess_idx: int, score: tuple[int, int]) -> int:
+
+        """
+
+        this function narrows the set down to the candidates that would have produced score, a (correct number,
+        correct location) pair, for the guess. the first update reads the guess's shared cached row for the whole
+        code space; every later update only scores the current survivors. returns the number of candidates left
+
+        Example Arg(s):
+            83, (2, 1) (int, tuple[int, int])
+        Example Return:
+            312 (int)
+
+        """
+
+        engine = get_engine(self.digit_count)
+        correct_number, correct_location = score
+        outcome = correct_number * (self.digit_count + 1) + correct_location
+
+        if self.idxs is None:
+            self.idxs = np.flatnonzero(engine.row(guess_idx) == outcome).astype(self.dtype)
+        else:
+            self.idxs = self.idxs[engine.compute_outcomes(guess_idx, self.idxs) == outcome]
+        self.cached_fingerprint = None
+        return len(self.idxs)
+
+    def apply_hint(self, hint) -> int:
+
+        """
+
+        this function narrows the set down to the candidates that would have produced the same hint (hint_class.py):
+        same last digit, digit sum, count of digits <= 3 or digit product, or not containing the absent digit.
+        returns the number of candidates left
+
+        Example Arg(s):
+            <Hint 1> (Hint)
+        Example Return:
+            480 (int)
+
+        """
+
+        idxs = self.as_array()
+        shifts = np.arange(self.digit_count - 1, -1, -1, dtype=np.uint32) * 3
+        digits = (idxs.astype(np.uint32)[:, None] >> shifts) & 7
+
+        match hint.hint_num:
+            case 0:
+                keep = digits[:, -1] == hint.value
+            case 1:
+                keep = digits.sum(axis=1) == hint.value
+            case 2:
+                keep = (digits <= 3).sum(axis=1) == hint.value
+            case 3:
+                keep = digits.prod(axis=1) == hint.value
+            case 4:
+                keep = ~(digits == hint.value).any(axis=1)
+            case _:
+                keep = np.ones(len(idxs), dtype=bool)
+
+        self.idxs = idxs[keep]
+        self.cached_fingerprint = None
+        return len(self.idxs)
+
+    def fingerprint(self) -> bytes:
+
+        """
+
+        this function returns a short digest that identifies exactly which candidates are left, so results computed
+        for one candidate set (e.g. partition histograms in solver_class.py) can be cached and shared by every
+        game that reaches the same set. the digest is computed once per update
+
+        Example Arg(s):
+            None
+        Example Return:
+            b"\\x9f\\x1c..." (bytes)
+
+        """
+
+        if self.cached_fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(self.digit_count.to_bytes(1, "little"))
+            if self.idxs is not None:
+                digest.update(self.idxs.astype(np.uint32, copy=False).tobytes())
+            self.cached_fingerprint = digest.digest()
+        return self.cached_fingerprint
+
+    def __contains__(self, code_idx: int) -> bool:
+        if self.idxs is None:
+            return 0 <= code_idx < self.num_codes
+        position = np.searchsorted(self.idxs, code_idx)
+        return position < len(self.idxs) and self.idxs[position] == code_idx
+
+    def as_array(self) -> np.ndarray:
+
+        """
+
+        this function returns the remaining candidates as an array of code indices, materializing the whole
+        code space if no guess has been scored yet
+
+        Example Arg(s):
+            None
+        Example Return:
+            array([83, 1234, 2700], dtype=uint16) (np.ndarray)
+
+        """
+
+        if self.idxs is None:
+            return np.arange(self.num_codes, dtype=self.dtype)
+        return self.idxs
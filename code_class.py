@@ -0,0 +1,193 @@
+#number of bits used to store one digit (digits 0-7, inclusive)
+BITS_PER_DIGIT=3
+
+#largest digit count a Code is expected to hold (the "hardest" difficulty)
+MAX_DIGIT_COUNT=6
+
+#characters a code string may be made of
+DIGIT_CHARS=frozenset("01234567")
+
+#for every supported digit count, an int with a 1 in the lowest bit of each 3 bit digit slot (0b001001001001 for 4 digits)
+LOW_BITS_MASKS={digit_count: int("001" * digit_count, 2) for digit_count in range(1, MAX_DIGIT_COUNT + 1)}
+
+#for every supported digit count, an int with a 1 in the highest bit of each 3 bit digit slot (0b100100100100 for 4 digits)
+HIGH_BITS_MASKS={digit_count: int("100" * digit_count, 2) for digit_count in range(1, MAX_DIGIT_COUNT + 1)}
+
+
+class Code(int):
+
+    """
+
+    compact representation of a game code (the answer or a guess). each digit 0-7 is packed into 3 bits of a
+    plain int, most significant digit first, with a single sentinel bit above the digits so that the digit count
+    (and any leading zeros) survives the packing. the digits without the sentinel are the code's index in the
+    code space used by FeedbackEngine (feedback_class.py). Code subclasses int without adding instance attributes,
+    so it costs no more memory than an int and compares/hashes like one
+
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_str(cls, code: str) -> "Code":
+
+        """
+
+        this function packs a code string into a Code, raising ValueError unless it is 1 to MAX_DIGIT_COUNT digits
+        between 0-7 (checked before int(), which would also take "0o17", " 17", "1_7" or "+17")
+
+        Example Arg(s):
+            "0017" (str)
+        Example Return:
+            Code('0017') (Code)
+
+        """
+
+        if not 0 < len(code) <= MAX_DIGIT_COUNT or not DIGIT_CHARS.issuperset(code):
+            raise ValueError(f"a code needs between 1 and {MAX_DIGIT_COUNT} digits between 0-7, got {code!r}")
+        return cls((1 << (BITS_PER_DIGIT * len(code))) | int(code, 8))
+
+    @classmethod
+    def from_index(cls, idx: int, digit_count: int) -> "Code":
+
+        """
+
+        this function packs a code space index into a Code with the given digit count
+
+        Example Arg(s):
+            15, 4 (int, int)
+        Example Return:
+            Code('0017') (Code)
+
+        """
+
+        return cls((1 << (BITS_PER_DIGIT * digit_count)) | idx)
+
+    @classmethod
+    def from_digits(cls, digits: list[int]) -> "Code":
+
+        """
+
+        this function packs a list of digits (most significant first) into a Code
+
+        Example Arg(s):
+            [0, 0, 1, 7] (list[int])
+        Example Return:
+            Code('0017') (Code)
+
+        """
+
+        packed = 1
+        for digit in digits:
+            packed = (packed << BITS_PER_DIGIT) | digit
+        return cls(packed)
+
+    @property
+    def digit_count(self) -> int:
+        return (self.bit_length() - 1) // BITS_PER_DIGIT
+
+    @property
+    def index(self) -> int:
+        return int(self) ^ (1 << (BITS_PER_DIGIT * self.digit_count))
+
+    def __str__(self) -> str:
+        return format(self.index, "0%so" % self.digit_count)
+
+    def __repr__(self) -> str:
+        return f"Code('{self}')"
+
+    def __len__(self) -> int:
+        return self.digit_count
+
+    def digits(self) -> list[int]:
+
+        """
+
+        this function unpacks the Code into a list of its digits, most significant first
+
+        Example Arg(s):
+            None
+        Example Return:
+            [0, 0, 1, 7] (list[int])
+
+        """
+
+        idx = self.index
+        return [(idx >> shift) & 7 for shift in range(BITS_PER_DIGIT * (self.digit_count - 1), -1, -BITS_PER_DIGIT)]
+
+    def last_digit(self) -> int:
+        return self.index & 7
+
+    def digit_sum(self) -> int:
+
+        """
+
+        this function returns the sum of the Code's digits
+
+        Example Arg(s):
+            None
+        Example Return:
+            8 (int)
+
+        """
+
+        idx = self.index
+        total = 0
+        while idx:
+            total += idx & 7
+            idx >>= BITS_PER_DIGIT
+        return total
+
+    def digit_product(self) -> int:
+
+        """
+
+        this function returns the product of the Code's digits
+
+        Example Arg(s):
+            None
+        Example Return:
+            0 (int)
+
+        """
+
+        product = 1
+        for digit in self.digits():
+            product *= digit
+        return product
+
+    def count_at_most_3(self) -> int:
+
+        """
+
+        this function returns how many digits of the Code are less than or equal to 3. a digit is <= 3 exactly
+        when the highest of its 3 bits is clear, so this is a single mask and popcount
+
+        Example Arg(s):
+            None
+        Example Return:
+            3 (int)
+
+        """
+
+        digit_count = self.digit_count
+        return digit_count - (self.index & HIGH_BITS_MASKS[digit_count]).bit_count()
+
+    def contains_digit(self, digit: int) -> bool:
+
+        """
+
+        this function checks whether a digit appears anywhere in the Code. the digit is repeated into every
+        3 bit slot and xor'ed against the Code, so a slot that holds the digit becomes 000; the bitwise or of
+        each slot's 3 bits then has a 0 in that slot's low bit
+
+        Example Arg(s):
+            7 (int)
+        Example Return:
+            True (bool)
+
+        """
+
+        low_bits_mask = LOW_BITS_MASKS[self.digit_count]
+        diff = self.index ^ (digit * low_bits_mask)
+        return (diff | (diff >> 1) | (diff >> 2)) & low_bits_mask != low_bits_mask
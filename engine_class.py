@@ -0,0 +1,233 @@
+from typing import NamedTuple
+from code_class import Code
+from entropy_class import ENTROPY
+from hint_class import Hint
+from feedback_class import get_engine
+from candidates_class import CandidateSet
+
+#game difficulties and the verbose names the user picks them by; the answer has 4 + difficulty digits
+DIFFICULTIES=[0, 1, 2]
+DIFFICULTY_NAMES={0: "hard", 1: "harder", 2: "hardest"}
+
+#number of unique hint templates that can be used to create hints at the start of each game
+NUM_UNIQUE_HINT_TEMPLATES=5
+
+#number of guesses the user gets each game
+MAX_GUESSES=10
+
+#number of hints the user gets on the easiest difficulty, one less per difficulty level above it
+MAX_HINTS=3
+
+
+class GuessResult(NamedTuple):
+
+    """
+
+    outcome of one GameEngine.submit() call
+
+    """
+
+    guess: Code
+    correct_number: int
+    correct_location: int
+    won: bool
+    lost: bool
+    guesses_remaining: int
+
+    @property
+    def score(self) -> tuple[int, int]:
+        return self.correct_number, self.correct_location
+
+
+class GameEngine:
+
+    """
+
+    headless MASTERMIND game: holds the state of one game at a time and applies the game rules (digit_count = 4 + difficulty,
+    10 guesses, 3 - difficulty hints) without any terminal I/O, sleeping or network access, so simulations, servers and
+    benchmarks can drive games directly. Game (game_class.py) is the interactive command line front end over it.
+    answers and hints are drawn from rng: the buffered OS entropy (entropy_class.py) by default, or a GameRNG (rng_class.py) to make
+    a game reproducible
+
+    """
+
+    def __init__(self, track_candidates: bool=False, rng=ENTROPY):
+        self.track_candidates: bool = track_candidates
+        self.rng = rng
+        self.difficulty: int = 0
+        self.digit_count: int = 4
+        self.ans: Code | None = None
+        self.hints: list = []
+        self.hints_idx: int = 0
+        self.guesses_remaining: int = 0
+        self.guess_history: list = []
+        self.candidates: CandidateSet | None = None
+        self.won: bool = False
+        self.feedback_engine = None
+
+    def new_game(self, difficulty: int, answer: str | Code | None=None, rng=None) -> None:
+
+        """
+
+        this function resets the engine to the start of a new game at a difficulty (0, 1 or 2 for hard, harder and
+        hardest). answer can be a code string, a Code, or None to generate a random answer offline. rng, when given,
+        replaces the engine's rng from this game on
+
+        Example Arg(s):
+            0, "1234", GameRNG(seed=7, game=12) (int, str | Code | None, GameRNG | None)
+        Example Return:
+            None
+
+        """
+
+        if rng is not None:
+            self.rng = rng
+        self.difficulty = difficulty
+        self.digit_count = 4 + difficulty
+        if answer is None:
+            self.ans = self.generate_offline_ans(difficulty, self.rng)
+        else:
+            self.ans = answer if isinstance(answer, Code) else Code.from_str(answer)
+        if self.ans.digit_count != self.digit_count:
+            raise ValueError(f"answer {self.ans} does not have {self.digit_count} digits")
+        self.hints = self.generate_hints()
+        self.hints_idx = 0
+        self.guesses_remaining = MAX_GUESSES
+        self.guess_history = []
+        self.candidates = CandidateSet(self.digit_count) if self.track_candidates else None
+        self.won = False
+        self.feedback_engine = get_engine(self.digit_count)
+
+    @staticmethod
+    def generate_offline_ans(difficulty: int, rng=ENTROPY) -> Code:
+
+        """
+
+        this function generates a random answer for a difficulty without the RNG API: one draw from rng (an
+        EntropyBuffer, python's random module or a GameRNG) of a code space index, whose 3 bit groups are the digits
+
+        Example Arg(s):
+            0, GameRNG(seed=7, game=12) (int, EntropyBuffer | random | GameRNG)
+        Example Return:
+            Code('1234') (Code)
+
+        """
+
+        digit_count = 4 + difficulty
+        return Code.from_index(rng.randrange(8 ** digit_count), digit_count)
+
+    def generate_hints(self) -> list[Hint]:
+
+        """
+
+        this function randomly picks 3 - difficulty distinct hint templates (out of NUM_UNIQUE_HINT_TEMPLATES) and
+        returns the Hint generated from each one for the current answer
+
+        Example Arg(s):
+            None
+        Example Return:
+            [<Hint 1>, <Hint 4>, <Hint 0>] (list[Hint])
+
+        """
+
+        num_unique_hint_templates = NUM_UNIQUE_HINT_TEMPLATES
+        hints: list = []
+        possible_hints = set(range(num_unique_hint_templates))
+        while len(hints) < MAX_HINTS - self.difficulty:
+            random_hint_num = self.rng.randint(0,num_unique_hint_templates-1)
+            if random_hint_num in possible_hints:
+                hints.append(Hint(ans=self.ans, hint_num=random_hint_num, rng=self.rng))
+                possible_hints.remove(random_hint_num)
+        return hints
+
+    @property
+    def hints_remaining(self) -> int:
+        return MAX_HINTS - self.hints_idx - self.difficulty
+
+    @property
+    def game_over(self) -> bool:
+        return self.won or self.guesses_remaining == 0
+
+    def parse_guess(self, guess: str) -> Code | None:
+
+        """
+
+        this function returns the guess packed into a Code if it is exactly digit_count digits between 0-7, otherwise None
+
+        Example Arg(s):
+            "1234" (str)
+        Example Return:
+            Code('1234') (Code)
+
+        """
+
+        if len(guess) != self.digit_count or not guess.isdigit():
+            return None
+        try:
+            return Code.from_str(guess)
+        except ValueError:
+            return None
+
+    def score_guess(self, guess: Code) -> tuple[int, int]:
+
+        """
+
+        this function scores a guess against the answer, returning its (correct number, correct location) counts
+        from the shared FeedbackEngine for this game's digit count (feedback_class.py)
+
+        Example Arg(s):
+            Code('1454') (Code)
+        Example Return:
+            (2, 2) (tuple[int, int])
+
+        """
+
+        return self.feedback_engine.feedback(guess.index, self.ans.index)
+
+    def submit(self, guess: str | Code) -> GuessResult:
+
+        """
+
+        this function plays one guess: it is scored, recorded in guess_history, narrows the candidate set (when tracked)
+        and uses up one of the remaining guesses. raises ValueError for a malformed guess or when the game is already over
+
+        Example Arg(s):
+            "1454" (str | Code)
+        Example Return:
+            GuessResult(guess=Code('1454'), correct_number=2, correct_location=2, won=False, lost=False, guesses_remaining=9) (GuessResult)
+
+        """
+
+        if self.game_over:
+            raise ValueError("the game is over, start a new one with new_game()")
+        code = guess if isinstance(guess, Code) else self.parse_guess(guess)
+        if code is None or code.digit_count != self.digit_count:
+            raise ValueError(f"{guess} is not {self.digit_count} digits between 0-7")
+
+        score = self.score_guess(code)
+        self.guess_history.append((code, score))
+        self.guesses_remaining -= 1
+        self.won = code == self.ans
+        if self.candidates is not None and not self.won:
+            self.candidates.update(code.index, score)
+
+        return GuessResult(code, score[0], score[1], self.won, not self.won and self.guesses_remaining == 0, self.guesses_remaining)
+
+    def request_hint(self) -> Hint | None:
+
+        """
+
+        this function returns the next unused hint of the game, or None when the user has no hints left
+
+        Example Arg(s):
+            None
+        Example Return:
+            <Hint 1> (Hint | None)
+
+        """
+
+        if self.hints_remaining <= 0:
+            return None
+        hint = self.hints[self.hints_idx]
+        self.hints_idx += 1
+        return hint
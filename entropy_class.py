@@ -0,0 +1,157 @@
+import os
+import threading
+import numpy as np
+from code_class import Code, BITS_PER_DIGIT
+
+#bytes of OS entropy an EntropyBuffer reads per refill (a multiple of 8, it is consumed as 64 bit words): 4 KiB
+#covers ~1,800 "hardest" answers or ~10,000 hint digits per os.urandom() call
+ENTROPY_BLOCK_BYTES=4096
+
+
+class EntropyBuffer:
+
+    """
+
+    random bits read from the operating system in large blocks. single draws (randrange() / randint(), the methods of
+    python's random module the game uses, so a buffer can be passed wherever the game takes an rng) slice just the bits
+    they need off a buffered 64 bit word: a 0-7 digit costs 3 bits and a whole answer one draw. codes() turns a single
+    read into many answers at once with numpy, 3 bits per digit, without a python call per digit. a forked child must
+    reset() its copy (ENTROPY does so on its own), or it hands out the same bits as its parent
+
+    """
+
+    def __init__(self, read_bytes=os.urandom, block_size: int=ENTROPY_BLOCK_BYTES):
+        self.read_bytes = read_bytes
+        self.block_size: int = block_size
+        self.words: list[int] = []
+        self.word: int = 0
+        self.bits_left: int = 0
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+
+        """
+
+        this function drops every buffered bit and replaces the lock (which a fork may have copied while held), so the
+        next draw reads fresh bits from the operating system
+
+        Example Arg(s):
+            None
+        Example Return:
+            None
+
+        """
+
+        self.words = []
+        self.word = 0
+        self.bits_left = 0
+        self.lock = threading.Lock()
+
+    def take_bits(self, bits: int) -> int:
+
+        """
+
+        this function returns the next bits (at most 64) random bits as an int, refilling the buffer with another
+        block when it runs dry. the unused bits of a word too short for the request are dropped, which keeps every
+        draw uniform
+
+        Example Arg(s):
+            3 (int)
+        Example Return:
+            5 (int)
+
+        """
+
+        with self.lock:
+            if self.bits_left < bits:
+                if not self.words:
+                    self.words = memoryview(self.read_bytes(self.block_size)).cast("Q").tolist()
+                self.word = self.words.pop()
+                self.bits_left = 64
+            self.bits_left -= bits
+            return (self.word >> self.bits_left) & ((1 << bits) - 1)
+
+    def randrange(self, n: int) -> int:
+
+        """
+
+        this function returns a uniformly random integer in [0, n), for n up to 2^64. power of two ranges (like the 8
+        digit values, or the 8^digit_count codes) take exactly their bits, other ranges reject the draws of
+        n.bit_length() bits that fall outside [0, n)
+
+        Example Arg(s):
+            8 (int)
+        Example Return:
+            5 (int)
+
+        """
+
+        if n <= 0:
+            raise ValueError(f"empty range for randrange({n})")
+        if n & (n - 1) == 0:
+            return self.take_bits(n.bit_length() - 1)
+        bits = n.bit_length()
+        while True:
+            x = self.take_bits(bits)
+            if x < n:
+                return x
+
+    def randint(self, a: int, b: int) -> int:
+
+        """
+
+        this function returns a uniformly random integer in [a, b], both included, like random.randint()
+
+        Example Arg(s):
+            0, 7 (int, int)
+        Example Return:
+            3 (int)
+
+        """
+
+        return a + self.randrange(b - a + 1)
+
+    def indices(self, n: int, digit_count: int) -> np.ndarray:
+
+        """
+
+        this function returns n uniformly random code space indices of digit_count digits as a numpy array, reading
+        n * 3 * digit_count bits in one call (bypassing the block buffer) and slicing them into codes with numpy: code i
+        is the bits at offset i * 3 * digit_count of the stream, cut out of the 4 byte window that holds them
+
+        Example Arg(s):
+            3, 4 (int, int)
+        Example Return:
+            array([ 668, 3585, 2931]) (np.ndarray)
+
+        """
+
+        bits = BITS_PER_DIGIT * digit_count
+        raw = np.frombuffer(self.read_bytes((n * bits + 7) // 8) + bytes(3), dtype=np.uint8).astype(np.uint32)
+        offsets = np.arange(n, dtype=np.int64) * bits
+        start = offsets >> 3
+        window = (raw[start] << 24) | (raw[start + 1] << 16) | (raw[start + 2] << 8) | raw[start + 3]
+        return ((window >> (32 - bits - (offsets & 7)).astype(np.uint32)) & ((1 << bits) - 1)).astype(np.int64)
+
+    def codes(self, n: int, digit_count: int) -> list[Code]:
+
+        """
+
+        this function returns n uniformly random Codes of digit_count digits (see indices())
+
+        Example Arg(s):
+            3, 4 (int, int)
+        Example Return:
+            [Code('1234'), Code('7001'), Code('5563')] (list[Code])
+
+        """
+
+        sentinel = 1 << (BITS_PER_DIGIT * digit_count)
+        return list(map(Code, (self.indices(n, digit_count) | sentinel).tolist()))
+
+
+#process wide buffer over os.urandom, the default rng of the engine and its hints. a forked child (e.g. a simulate.py
+#worker) starts with an empty buffer of its own instead of replaying the parent's buffered bits
+ENTROPY=EntropyBuffer()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ENTROPY.reset)
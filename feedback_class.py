@@ -0,0 +1,497 @@
+import numpy as np
+from collections import OrderedDict
+from code_class import LOW_BITS_MASKS, MAX_DIGIT_COUNT, DIGIT_CHARS
+
+#number of distinct digits a code can be made from (digits 0-7, inclusive)
+NUM_DIGIT_VALUES=8
+
+#largest code space (in codes) that FeedbackEngine will precompute a full guess x answer table for. 8^4 = 4096 codes
+#gives a 16 MB table; 8^5 and 8^6 would need 1 GB and 68 GB, so those spaces are served one row at a time
+MAX_FULL_TABLE_CODES=8**4
+
+#number of rows (one row = feedback of one code against every code in the space) kept in each engine's LRU cache
+ROW_CACHE_SIZE=64
+
+#number of guess rows computed per chunk while building a full table, keeps temporary arrays small
+TABLE_BUILD_CHUNK=256
+
+#number of (guess, candidate) pairs scored per chunk by partition_counts_many(), keeps temporary arrays around 32 MB
+PARTITION_CHUNK_PAIRS=2**22
+
+#the SWAR (simd within a register) kernel always works on codes padded to MAX_DIGIT_COUNT digits, so its cost is the same
+#for every difficulty. padding digits are 0 in both codes: they never count as a location mismatch and add exactly
+#(MAX_DIGIT_COUNT - digit_count) matching 0s to the correct number, which is subtracted back out of the digit counts
+PADDED_LOW_BITS_MASK=LOW_BITS_MASKS[MAX_DIGIT_COUNT]
+PADDED_TOP_SLOT_SHIFT=3 * (MAX_DIGIT_COUNT - 1)
+
+#packed digit counts hold how many times each digit 0-7 appears in a code as eight 4 bit fields (digit 0 in the lowest field)
+COUNT_FIELDS_HIGH_BITS=0x88888888
+COUNT_FIELDS_SUM_MULTIPLIER=0x11111111
+
+#packed digit counts of every 2 digit chunk (6 bits) of a code, so a padded code's counts are the sum of 3 table reads
+PAIR_DIGIT_COUNTS=[(1 << (4 * (pair >> 3))) + (1 << (4 * (pair & 7))) for pair in range(64)]
+
+
+def code_to_index(code: str) -> int:
+
+    """
+
+    this function converts a code string (digits 0-7) into its index in the code space. because every digit
+    is between 0 and 7, the index is simply the code read as a base 8 number. raises ValueError for an empty code or
+    a character other than 0-7 (int() alone would also take "0o17", " 17", "1_7" or "+17")
+
+    Example Arg(s):
+        "0017" (str)
+    Example Return:
+        15 (int)
+
+    """
+
+    if not code or not DIGIT_CHARS.issuperset(code):
+        raise ValueError(f"a code is made of digits 0-7, got {code!r}")
+    return int(code, NUM_DIGIT_VALUES)
+
+
+def index_to_code(idx: int, digit_count: int) -> str:
+
+    """
+
+    this function converts a code index back into its zero padded code string
+
+    Example Arg(s):
+        15, 4 (int, int)
+    Example Return:
+        "0017" (str)
+
+    """
+
+    return format(idx, "0%so" % digit_count)
+
+
+def codes_to_indices(codes, digit_count: int) -> np.ndarray:
+
+    """
+
+    this function converts many codes into a uint32 array of code indices in one vectorized pass. codes can
+    already be integer code indices (returned as is) or a sequence of code strings, which are decoded from
+    their raw ascii bytes without a per-code int() call. raises ValueError for an index outside the code space, or
+    a string that doesn't have exactly digit_count digits between 0-7
+
+    Example Arg(s):
+        ["0017", "7777"], 4 (list[str], int)
+    Example Return:
+        array([15, 4095], dtype=uint32) (np.ndarray)
+
+    """
+
+    codes = np.asarray(codes)
+    if codes.size == 0:
+        return np.empty(0, dtype=np.uint32)
+    if codes.dtype.kind in "iu":
+        if codes.min() < 0 or codes.max() >= NUM_DIGIT_VALUES ** digit_count:
+            raise ValueError(f"code indices must be between 0 and {NUM_DIGIT_VALUES ** digit_count - 1}")
+        return codes.astype(np.uint32, copy=False)
+    if codes.dtype.kind not in "US" or (np.char.str_len(codes) != digit_count).any():
+        raise ValueError(f"codes must be strings of {digit_count} digits")
+
+    raw_digits = codes.astype("S%s" % digit_count).view(np.uint8).reshape(-1, digit_count) - np.uint8(ord("0"))
+    if (raw_digits >= NUM_DIGIT_VALUES).any():
+        raise ValueError("codes are made of digits 0-7")
+    shifts = np.arange(digit_count - 1, -1, -1, dtype=np.uint32) * 3
+    return (raw_digits.astype(np.uint32) << shifts).sum(axis=1, dtype=np.uint32)
+
+
+def packed_digit_counts(code_idxs, digit_count: int, pair_digit_counts=PAIR_DIGIT_COUNTS):
+
+    """
+
+    this function returns the packed digit counts (see COUNT_FIELDS_HIGH_BITS) of a code index, or of a uint32 array
+    of code indices when pair_digit_counts is passed in as a uint32 array. it is three table reads regardless of digit count
+
+    Example Arg(s):
+        15, 4 (int, int)
+    Example Return:
+        0x10000012 (int)
+
+    """
+
+    return (pair_digit_counts[code_idxs & 63]
+            + pair_digit_counts[(code_idxs >> 6) & 63]
+            + pair_digit_counts[(code_idxs >> 12) & 63]
+            - (MAX_DIGIT_COUNT - digit_count))
+
+
+def swar_score(guess_idx, code_idxs, guess_counts, code_counts, digit_count: int):
+
+    """
+
+    this function is the branch free scoring kernel. it works on python ints and on numpy uint32 arrays alike and
+    returns (correct location, correct number):
+
+    1.  correct location: the guess is xor'ed against the code so every matching digit slot becomes 000. or'ing each
+        slot's 3 bits into its low bit marks the mismatched slots, and multiplying by the low bits mask adds those
+        marks up in the top slot
+
+    2.  correct number: the sum over digits 0-7 of min(code count, guess count). a per field "code count >= guess
+        count" flag falls out of one subtraction with guard bits, the flag is widened into a field mask to select
+        the smaller count of every field, and multiplying by 0x11111111 adds all 8 fields up in the top field
+
+    Example Arg(s):
+        83, 1234, 0x1111, 0x1300, 4 (int, int, int, int, int)
+    Example Return:
+        (1, 2) (tuple[int, int])
+
+    """
+
+    diff = guess_idx ^ code_idxs
+    mismatched_slots = (diff | (diff >> 1) | (diff >> 2)) & PADDED_LOW_BITS_MASK
+    correct_location = digit_count - (((mismatched_slots * PADDED_LOW_BITS_MASK) >> PADDED_TOP_SLOT_SHIFT) & 7)
+
+    code_count_ge = ((code_counts | COUNT_FIELDS_HIGH_BITS) - guess_counts) & COUNT_FIELDS_HIGH_BITS
+    take_guess_count = (code_count_ge >> 3) * 7
+    min_counts = code_counts ^ ((code_counts ^ guess_counts) & take_guess_count)
+    correct_number = ((min_counts * COUNT_FIELDS_SUM_MULTIPLIER) >> 28) & 15
+    return correct_location, correct_number
+
+
+def score_pair(guess_idx: int, ans_idx: int, digit_count: int) -> tuple[int, int]:
+
+    """
+
+    this function scores a single guess index against a single answer index with the SWAR kernel and returns
+    (correct number, correct location), without touching any table
+
+    Example Arg(s):
+        83, 1234, 4 (int, int, int)
+    Example Return:
+        (2, 1) (tuple[int, int])
+
+    """
+
+    correct_location, correct_number = swar_score(guess_idx, ans_idx,
+                                                  packed_digit_counts(guess_idx, digit_count),
+                                                  packed_digit_counts(ans_idx, digit_count),
+                                                  digit_count)
+    return correct_number, correct_location
+
+
+def num_outcomes(digit_count: int) -> int:
+
+    """
+
+    this function returns how many distinct outcome ids a code space can produce. an outcome id packs
+    (correct number, correct location) into one small integer: correct_number * (digit_count + 1) + correct_location
+
+    Example Arg(s):
+        4 (int)
+    Example Return:
+        25 (int)
+
+    """
+
+    return (digit_count + 1) ** 2
+
+
+def decode_outcome(outcome: int, digit_count: int) -> tuple[int, int]:
+
+    """
+
+    this function unpacks an outcome id into its (correct number, correct location) pair
+
+    Example Arg(s):
+        12, 4 (int, int)
+    Example Return:
+        (2, 2) (tuple[int, int])
+
+    """
+
+    return divmod(int(outcome), digit_count + 1)
+
+
+class FeedbackEngine:
+
+    """
+
+    builds, caches and serves precomputed feedback for one code space (every code with digit_count digits
+    between 0 and 7). feedback is stored as outcome ids (see num_outcomes()) in uint8 arrays indexed by code index,
+    so scoring a guess against an answer is a table read instead of a per-digit python loop
+
+    """
+
+    def __init__(self, digit_count: int):
+        self.digit_count: int = digit_count
+        self.num_codes: int = NUM_DIGIT_VALUES ** digit_count
+        self.code_idxs: np.ndarray = np.arange(self.num_codes, dtype=np.uint32)
+        self.packed_counts: np.ndarray = packed_digit_counts(self.code_idxs, digit_count, np.array(PAIR_DIGIT_COUNTS, dtype=np.uint32))
+        self.table: np.ndarray | None = None
+        self.rows: OrderedDict = OrderedDict()
+
+    def score_many(self, guess_idx: int, code_idxs: np.ndarray | slice = slice(None)) -> tuple[np.ndarray, np.ndarray]:
+
+        """
+
+        this function scores one guess against many codes of the code space in one vectorized call of the SWAR
+        kernel (swar_score()) and returns a (correct location, correct number) pair of uint8 arrays, one entry per code.
+        code_idxs can be an array of code indices or a slice of the code space (default is every code)
+
+        Example Arg(s):
+            83, np.array([0, 1234, 4095]) (int, np.ndarray | slice)
+        Example Return:
+            (array([1, 1, 0], dtype=uint8), array([1, 2, 0], dtype=uint8)) (tuple[np.ndarray, np.ndarray])
+
+        """
+
+        if isinstance(code_idxs, slice):
+            code_idxs = self.code_idxs[code_idxs]
+        correct_location, correct_number = swar_score(np.uint32(guess_idx), code_idxs,
+                                                      self.packed_counts[guess_idx], self.packed_counts[code_idxs],
+                                                      self.digit_count)
+        return correct_location.astype(np.uint8), correct_number.astype(np.uint8)
+
+    def compute_outcomes(self, code_idx: int, others: np.ndarray | slice = slice(None)) -> np.ndarray:
+
+        """
+
+        this function scores one code against many codes of the code space at once and returns their outcome ids
+
+        Example Arg(s):
+            83, slice(None) (int, np.ndarray | slice)
+        Example Return:
+            array([6, 11, 11, ...], dtype=uint8) (np.ndarray)
+
+        """
+
+        correct_location, correct_number = self.score_many(code_idx, others)
+        return correct_number * np.uint8(self.digit_count + 1) + correct_location
+
+    def partition_counts(self, guess_idx: int, candidate_idxs: np.ndarray | None = None) -> np.ndarray:
+
+        """
+
+        this function returns the feedback partition histogram of one guess: how many candidates fall into each
+        outcome id (see num_outcomes()). candidate_idxs is an array of code indices, or None for the whole code space,
+        in which case the guess's cached row is reused. counting is a single np.bincount over the outcome ids
+
+        Example Arg(s):
+            83, np.array([0, 1234, 4095]) (int, np.ndarray | None)
+        Example Return:
+            array([1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, ...]) (np.ndarray)
+
+        """
+
+        if candidate_idxs is None:
+            outcomes = self.row(guess_idx)
+        elif self.table is not None:
+            outcomes = self.table[guess_idx, candidate_idxs]
+        else:
+            outcomes = self.compute_outcomes(guess_idx, candidate_idxs)
+        return np.bincount(outcomes, minlength=num_outcomes(self.digit_count))
+
+    def partition_counts_many(self, guess_idxs: np.ndarray, candidate_idxs: np.ndarray | None = None) -> np.ndarray:
+
+        """
+
+        this function returns the feedback partition histograms of many guesses against the same candidates as a
+        (len(guess_idxs), num_outcomes) array, one row per guess. guesses are scored in chunks of outcome matrices
+        and each chunk is counted with a single np.bincount by offsetting every guess's outcome ids into its own row
+
+        Example Arg(s):
+            np.array([0, 83]), np.array([0, 1234, 4095]) (np.ndarray, np.ndarray | None)
+        Example Return:
+            array([[2, 0, 0, ...], [1, 0, 0, ...]]) (np.ndarray)
+
+        """
+
+        if candidate_idxs is None:
+            candidate_idxs = self.code_idxs
+        bucket_count = num_outcomes(self.digit_count)
+        guess_idxs = np.asarray(guess_idxs, dtype=np.uint32)
+        candidate_counts = self.packed_counts[candidate_idxs]
+        partitions = np.empty((len(guess_idxs), bucket_count), dtype=np.int64)
+        chunk = max(1, PARTITION_CHUNK_PAIRS // max(1, len(candidate_idxs)))
+
+        for start in range(0, len(guess_idxs), chunk):
+            guess_chunk = guess_idxs[start:start + chunk]
+            if self.table is not None:
+                outcomes = self.table[np.ix_(guess_chunk, candidate_idxs)]
+            else:
+                correct_location, correct_number = swar_score(guess_chunk[:, None], candidate_idxs[None, :],
+                                                              self.packed_counts[guess_chunk][:, None], candidate_counts[None, :],
+                                                              self.digit_count)
+                outcomes = correct_number * (self.digit_count + 1) + correct_location
+            offsets = np.arange(len(guess_chunk), dtype=np.int64)[:, None] * bucket_count
+            partitions[start:start + len(guess_chunk)] = np.bincount((outcomes + offsets).ravel(), minlength=len(guess_chunk) * bucket_count).reshape(-1, bucket_count)
+        return partitions
+
+    def build_table(self) -> np.ndarray:
+
+        """
+
+        this function precomputes the full guess x answer outcome table for small code spaces (see MAX_FULL_TABLE_CODES).
+        once built, every lookup() on this engine is a single table read
+
+        Example Arg(s):
+            None
+        Example Return:
+            array([[24, 18, ...], ...], dtype=uint8) (np.ndarray)
+
+        """
+
+        if self.table is not None:
+            return self.table
+        if self.num_codes > MAX_FULL_TABLE_CODES:
+            raise ValueError(f"code space of {self.num_codes} codes is too large for a full feedback table")
+
+        n = self.num_codes
+        d = self.digit_count
+        table = np.empty((n, n), dtype=np.uint8)
+        for start in range(0, n, TABLE_BUILD_CHUNK):
+            stop = min(start + TABLE_BUILD_CHUNK, n)
+            correct_location, correct_number = swar_score(self.code_idxs[start:stop, None], self.code_idxs[None, :],
+                                                          self.packed_counts[start:stop, None], self.packed_counts[None, :], d)
+            table[start:stop] = correct_number * (d + 1) + correct_location
+        self.table = table
+        return table
+
+    def row(self, code_idx: int) -> np.ndarray:
+
+        """
+
+        this function returns the outcome ids of one code against every code in the code space. rows are served
+        from the full table when it exists, otherwise they are computed once and kept in a bounded LRU cache.
+        feedback is symmetric, so a row serves both "this guess against every answer" and "every guess against this answer"
+
+        Example Arg(s):
+            83 (int)
+        Example Return:
+            array([6, 11, 11, ...], dtype=uint8) (np.ndarray)
+
+        """
+
+        if self.table is not None:
+            return self.table[code_idx]
+
+        cached_row = self.rows.get(code_idx)
+        if cached_row is not None:
+            self.rows.move_to_end(code_idx)
+            return cached_row
+
+        new_row = self.compute_outcomes(code_idx)
+        new_row.flags.writeable = False
+        self.rows[code_idx] = new_row
+        if len(self.rows) > ROW_CACHE_SIZE:
+            self.rows.popitem(last=False)
+        return new_row
+
+    def lookup(self, guess_idx: int, ans_idx: int) -> int:
+
+        """
+
+        this function returns the outcome id of a single guess against a single answer by reading it from the
+        precomputed table or a cached row. when neither is available the pair is scored directly with the SWAR
+        kernel instead of computing a whole row for one entry
+
+        Example Arg(s):
+            83, 1234 (int, int)
+        Example Return:
+            11 (int)
+
+        """
+
+        if self.table is not None:
+            return int(self.table[guess_idx, ans_idx])
+        if guess_idx in self.rows:
+            return int(self.row(guess_idx)[ans_idx])
+        if ans_idx in self.rows:
+            return int(self.row(ans_idx)[guess_idx])
+        correct_number, correct_location = score_pair(guess_idx, ans_idx, self.digit_count)
+        return correct_number * (self.digit_count + 1) + correct_location
+
+    def feedback(self, guess_idx: int, ans_idx: int) -> tuple[int, int]:
+
+        """
+
+        this function returns the (correct number, correct location) pair of a guess against an answer
+
+        Example Arg(s):
+            83, 1234 (int, int)
+        Example Return:
+            (2, 1) (tuple[int, int])
+
+        """
+
+        return decode_outcome(self.lookup(guess_idx, ans_idx), self.digit_count)
+
+
+#one engine per digit count, shared by every game in the process so rows and tables are built once
+ENGINES: dict[int, FeedbackEngine] = {}
+
+
+def get_engine(digit_count: int, full_table: bool=False) -> FeedbackEngine:
+
+    """
+
+    this function returns the process wide FeedbackEngine for a digit count, creating it on first use. with
+    full_table, an engine whose code space is small enough (see MAX_FULL_TABLE_CODES) also builds its full table, so
+    every feedback is a table read. the build takes a fraction of a second, so only bulk users (solvers, simulations)
+    ask for it: the interactive game scores its few guesses pair by pair instead of paying for it at startup
+
+    Example Arg(s):
+        4, True (int, bool)
+    Example Return:
+        <FeedbackEngine digit_count=4> (FeedbackEngine)
+
+    """
+
+    engine = ENGINES.get(digit_count)
+    if engine is None:
+        engine = ENGINES[digit_count] = FeedbackEngine(digit_count)
+    if full_table and engine.num_codes <= MAX_FULL_TABLE_CODES:
+        engine.build_table()
+    return engine
+
+
+def generate_guess_feedback_many(guess: str, codes) -> tuple[np.ndarray, np.ndarray]:
+
+    """
+
+    this function is the batch counterpart to Game.generate_guess_feedback(): it scores one guess against an
+    array of codes (code strings or code indices with the same digit count as the guess) in one vectorized call
+    and returns (correct location, correct number) arrays with the same semantics as the single guess feedback.
+    raises ValueError for a malformed guess or code
+
+    Example Arg(s):
+        "1454", ["1234", "7777", "4541"] (str, list[str] | np.ndarray)
+    Example Return:
+        (array([2, 0, 0], dtype=uint8), array([2, 0, 4], dtype=uint8)) (tuple[np.ndarray, np.ndarray])
+
+    """
+
+    digit_count = len(guess)
+    if not 0 < digit_count <= MAX_DIGIT_COUNT:
+        raise ValueError(f"a code needs between 1 and {MAX_DIGIT_COUNT} digits between 0-7, got {guess!r}")
+    engine = get_engine(digit_count)
+    return engine.score_many(code_to_index(guess), codes_to_indices(codes, digit_count))
+
+
+def generate_feedback_partition(guess: str, codes=None) -> np.ndarray:
+
+    """
+
+    this function returns, for one guess, a histogram of how a set of candidate codes (code strings or code indices
+    with the same digit count as the guess, or None for every code) splits across every possible feedback outcome.
+    bucket i counts the candidates whose (correct number, correct location) is decode_outcome(i, len(guess))
+
+    Example Arg(s):
+        "1454", ["1234", "7777", "4541"] (str, list[str] | np.ndarray | None)
+    Example Return:
+        array([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0]) (np.ndarray)
+
+    """
+
+    digit_count = len(guess)
+    if not 0 < digit_count <= MAX_DIGIT_COUNT:
+        raise ValueError(f"a code needs between 1 and {MAX_DIGIT_COUNT} digits between 0-7, got {guess!r}")
+    engine = get_engine(digit_count)
+    candidate_idxs = None if codes is None else codes_to_indices(codes, digit_count)
+    return engine.partition_counts(code_to_index(guess), candidate_idxs)
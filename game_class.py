@@ -1,37 +1,33 @@
-import requests
 import os
 import sys
-import json
 import time
-import random
 import re
-from dotenv import load_dotenv
+import threading
 from collections import defaultdict
-from hint_class import Hint
-
-#loads env
-load_dotenv()
-
-#gets different RNG parameters from RNG API based off of difficulty level
-URL=os.environ.get("RNG_URL")
-PARAMS_FOR_DIFFICULTY_LEVEL_ZERO=json.loads(os.environ.get("RNG_PARAMS_FOR_DIFFICULTY_LEVEL_ZERO"))
-PARAMS_FOR_DIFFICULTY_LEVEL_ONE=json.loads(os.environ.get("RNG_PARAMS_FOR_DIFFICULTY_LEVEL_ONE"))
-PARAMS_FOR_DIFFICULTY_LEVEL_TWO=json.loads(os.environ.get("RNG_PARAMS_FOR_DIFFICULTY_LEVEL_TWO"))
-
-#number of unique hint templates that can be used to create hints at the start of each game
-NUM_UNIQUE_HINT_TEMPLATES=5
+from concurrent.futures import Future
+from code_class import Code
+from engine_class import GameEngine, DIFFICULTIES, DIFFICULTY_NAMES
+from timing import phase, process_age
+import metrics
+from answer_source_class import AnswerSource, UrandomAnswerSource, get_answer_source
 
 #keywords that user can input
 KEYWORDS=["/guess_history", "/hint", "/hint_history", "/score"]
 
 #various tools used for UI/UX
-from uiux import TITLE, WIN_MSG, LOSE_MSG, LINE
+from uiux import TITLE, WIN_MSG, LOSE_MSG, LINE, CLEAR_SCREEN
 
 
-#main game class
+#main game class, the interactive command line front end over the headless GameEngine (engine_class.py)
 class Game:
-    def __init__(self, show_ans: bool=False):
+    def __init__(self, show_ans: bool=False, fast_start: bool=False, started_at: float | None=None, answer_source: AnswerSource | None=None):
         self.show_ans: bool = show_ans
+        self.fast_start: bool = fast_start
+        self.started_at: float | None = started_at
+        self.answer_source: AnswerSource = answer_source if answer_source is not None else get_answer_source()
+        self.offline_source: AnswerSource = UrandomAnswerSource()
+        self.pending_answers: dict[int, Future] = {}
+        self.engine: GameEngine = GameEngine(track_candidates=False)
         self.refresh_game_attributes(replay=False)
         self.run_game()
 
@@ -41,9 +37,10 @@ class Game:
         
         this function refreshes all of the game attributes needed to play a new game. handles the case when a new game is started OR ask_user_replay()
         AND one of its two parent functions: handle_win_ask_replay() or handle_lose_ask_replay() return True (ln 598, ln 610), meaning the user does
-        want to replay the game. it plays the welcome animation slightly altered to reflect that user is replaying the game), resets all of the relevant
-        instance variables to game starting values, asks for the user difficulty again, fetches a new RNG API answer based on the parameters
-        that correlate to the user input difficulty level, and generates new hints
+        want to replay the game. it plays the welcome animation slightly altered to reflect that user is replaying the game), asks for the user
+        difficulty again, fetches a new RNG API answer based on the parameters that correlate to the user input difficulty level and starts a new
+        game on the engine with it, which resets the guesses, hints and candidate set (every answer consistent with the feedback given so far).
+        the answers are requested speculatively (prefetch_answers()) before the animation, so the fetch overlaps with it and the difficulty prompt
 
         Example Arg(s):
             None
@@ -52,17 +49,19 @@ class Game:
         
         """
 
-        self.print_welcome_animation(replay=replay)
-        self.score: int = self.read_score_from_file()
+        self.prefetch_answers()
+        with phase("welcome_animation"):
+            self.print_welcome_animation(replay=replay)
+        with phase("read_score_from_file"):
+            self.score: int = self.read_score_from_file()
         self.difficulty: int = self.input_user_difficulty()
-        self.ans: str = self.fetch_answer()
-        self.hints: list = self.generate_hints()
-        self.hints_idx: int = 0
-        self.digit_count: int = 4 + self.difficulty
-        self.guesses_remaining: int = 10
-        self.guess_history: list = []
-        print("\rSYS_MESSAGE: show_ans = True. Answer = ",self.ans,"\n") if self.show_ans == True else True
-        print(f"MASTERMIND: I'm thinking of a {self.digit_count} digit number using digits between 0 and 7. Try and guess it, if you dare!\n")
+        with phase("fetch_answer"):
+            answer = self.fetch_answer()
+        with phase("new_game"):
+            self.engine.new_game(self.difficulty, answer=answer)
+        metrics.GAMES_STARTED.inc(difficulty=DIFFICULTY_NAMES[self.difficulty])
+        print("\rSYS_MESSAGE: show_ans = True. Answer = ",self.engine.ans,"\n") if self.show_ans == True else True
+        print(f"MASTERMIND: I'm thinking of a {self.engine.digit_count} digit number using digits between 0 and 7. Try and guess it, if you dare!\n")
         return
 
     def print_welcome_animation(self, replay: bool=False) -> None:
@@ -70,7 +69,8 @@ class Game:
         """
 
         this function clears the terminal and prints the welcome animation to start the game. if replay boolean is true,
-        function slightly alters welcome message.
+        function slightly alters welcome message. in fast start mode the animation doesn't pause and the terminal is
+        cleared without spawning a subprocess
 
         Example Arg(s):
             replay=False (default value is False) (bool)
@@ -79,16 +79,75 @@ class Game:
 
         """
 
-        os.system("clear")
+        self.clear_terminal()
 
         if replay == False:
             print("Welcome! You have entered the lair of the...")
         else:
             print("Ah! I see you have returned. You have once again entered the lair of the...")
-        time.sleep(2.0)
+        self.pause(2.0)
         print(TITLE)
-        time.sleep(2.0)
-        os.system("clear")
+        self.pause(2.0)
+        self.clear_terminal()
+
+    def clear_terminal(self) -> None:
+
+        """
+
+        this function clears the terminal, with the clear command normally or with an ANSI escape sequence in fast start mode
+
+        Example Arg(s):
+            None
+        Example Return:
+            None
+
+        """
+
+        if self.fast_start:
+            sys.stdout.write(CLEAR_SCREEN)
+        else:
+            os.system("clear")
+
+    def pause(self, seconds: float) -> None:
+
+        """
+
+        this function pauses the game for dramatic effect, unless the game is in fast start mode
+
+        Example Arg(s):
+            2.0 (float)
+        Example Return:
+            None
+
+        """
+
+        if not self.fast_start:
+            time.sleep(seconds)
+
+    def report_startup_latency(self) -> None:
+
+        """
+
+        this function reports, once per process, how long it took from process start (as the OS recorded it, see
+        timing.process_age()) until the first prompt. where that isn't available it reports the time since started_at
+        instead, a time.perf_counter() reading taken by run.py once the interpreter was up. it writes to stderr so it
+        doesn't interleave with the game itself
+
+        Example Arg(s):
+            None
+        Example Return:
+            None
+
+        """
+
+        if self.started_at is None:
+            return
+        age = process_age()
+        if age is not None:
+            sys.stderr.write(f"\rSYS_MESSAGE: {1000 * age:.0f} ms from process start to first prompt\n")
+        else:
+            sys.stderr.write(f"\rSYS_MESSAGE: {1000 * (time.perf_counter() - self.started_at):.1f} ms from interpreter start to first prompt\n")
+        self.started_at = None
     
     def input_user_difficulty(self) -> int:
 
@@ -104,72 +163,88 @@ class Game:
 
         """
 
-        verbose_difficulty_to_int_difficulty_mapping = {"hard":0, "harder":1, "hardest":2}
+        verbose_difficulty_to_int_difficulty_mapping = {name: difficulty for difficulty, name in DIFFICULTY_NAMES.items()}
 
         print("MASTERMIND: Enter a difficulty (hard, harder, or hardest):\n")
         sys.stdout.write("Difficulty: ")
-        verbose_difficulty = input()
+        self.report_startup_latency()
+        with phase("input_wait"):
+            verbose_difficulty = input()
         print("\n",LINE,"\n")
-        while verbose_difficulty.lower() not in ["hard", "harder", "hardest"]:
+        while verbose_difficulty.lower() not in verbose_difficulty_to_int_difficulty_mapping:
             print("\nMASTERMIND: Ugh! I said choose between hard, harder, or hardest!!!\n")
             print("MASTERMIND: Enter a difficulty (hard, harder, or hardest):\n")
             sys.stdout.write("Difficulty: ")
-            verbose_difficulty = input()
+            with phase("input_wait"):
+                verbose_difficulty = input()
             print("\n",LINE,"\n")
 
-        return verbose_difficulty_to_int_difficulty_mapping[verbose_difficulty]
+        return verbose_difficulty_to_int_difficulty_mapping[verbose_difficulty.lower()]
 
-    def fetch_answer(self) -> str:
+    def fetch_answer(self) -> Code:
 
         """
         
-        this function uses the random number generator API and the corresponding API parameters (different
-        difficulties of game require different parameters) to generate an answer string that is returned and
-        saved as the self.ans instance variable
+        this function takes the answer for the chosen difficulty from the game's answer source (answer_source_class.py,
+        by default the prefetched answer pool, which refills itself from the random number generator API in the
+        background, falling back to the API itself). when the source isn't ready it uses the speculative take
+        prefetch_answers() started for the chosen difficulty (waiting for it if it is still in flight). if the source
+        fails the answer comes from the offline source (the OS entropy buffer) instead. the answer is a Code, returned
+        and used as the answer of the engine's new game
 
         Example Arg(s):
             None
         Example Return:
-            "1234" (str)
+            Code('1234') (Code)
 
         """
+        started = time.perf_counter()
+        digit_count = 4 + self.difficulty
         try:
-            if self.difficulty == 1:
-                raw_ans = requests.get(url=URL, params=PARAMS_FOR_DIFFICULTY_LEVEL_ONE)
-            elif self.difficulty == 2:
-                raw_ans = requests.get(url=URL, params=PARAMS_FOR_DIFFICULTY_LEVEL_TWO)
+            pending_answer = self.pending_answers.pop(self.difficulty, None)
+            if pending_answer is not None and not self.answer_source.ready(digit_count):
+                ans = pending_answer.result()
             else:
-                raw_ans = requests.get(url=URL, params=PARAMS_FOR_DIFFICULTY_LEVEL_ZERO)
-
-            ans = raw_ans.text.replace("\n","")
-        except BaseException as e:
+                ans = self.answer_source.take(1, digit_count)[0]
+        except Exception as e:
             print(f"API FAILURE: {e}\n\nENTERING OFFLINE MODE...\n")
-            ans = self.generate_offline_ans()
-            
+            metrics.FETCH_ANSWER_FAILURES.inc()
+            metrics.OFFLINE_FALLBACKS.inc(difficulty=DIFFICULTY_NAMES[self.difficulty])
+            ans = self.offline_source.take(1, digit_count)[0]
+        metrics.FETCH_ANSWER_SECONDS.observe(time.perf_counter() - started)
 
         return ans
 
-    def generate_offline_ans(self) -> str:
+    def prefetch_answers(self) -> None:
 
         """
-        
-        this function is called if the RNG API can't be accessed and a random answer needs to be generated offline
+
+        this function starts taking an answer for every difficulty from the answer source in background threads, before
+        the user has picked one, so the take that matches their pick (e.g. an RNG API request) is usually done by the
+        time fetch_answer() needs it. nothing is taken when the source can already serve any difficulty instantly
 
         Example Arg(s):
             None
         Example Return:
             None
-        
+
         """
 
-        difficulty_digits_mapping = {0:4, 1:5, 2:6}
-        offline_ans = ""
-        for digit in range(difficulty_digits_mapping[self.difficulty]):
-            offline_ans += str(random.randint(0,7))
-        return offline_ans
-    
+        self.pending_answers = {}
+        if self.answer_source.ready(4 + max(DIFFICULTIES)):
+            return
+
+        def request_into(difficulty: int, future: Future) -> None:
+            try:
+                future.set_result(self.answer_source.take(1, 4 + difficulty)[0])
+            except BaseException as e:
+                future.set_exception(e)
+
+        for difficulty in DIFFICULTIES:
+            future = Future()
+            threading.Thread(target=request_into, args=(difficulty, future), daemon=True).start()
+            self.pending_answers[difficulty] = future
 
-    
     def read_score_from_file(self) -> int:
 
         """
@@ -222,34 +297,7 @@ class Game:
             sys.stdout.write(f"\n\rScore: {self.score}\n")
 
 
-    def generate_hints(self) -> list[str]:
-
-        """
-        
-        this function is used together with generate_hint() (ln 203) and python's random module to randomly generate
-        a number which is then plugged into generate_hint which returns a hint and appends it to the hints list instance
-        attribute (ln 266). NUM_UNIQUE_HINT_TEMPLATES is a variable that represents the total number of unique hint
-        templates that hints can be made from (ln 21)
-
-        Example Arg(s):
-            None
-        Example Return:
-            ["hint_a", "hint_b", "hint_c"] (list[str])
-
-        """
-
-        num_unique_hint_templates = NUM_UNIQUE_HINT_TEMPLATES
-        hints: list = []
-        possible_hints = set(range(num_unique_hint_templates))
-        while len(hints) < 3 - self.difficulty:
-            random_hint_num = random.randint(0,num_unique_hint_templates-1)
-            if random_hint_num in possible_hints:
-                hints.append(Hint(ans=self.ans, hint_num=random_hint_num).description)
-                possible_hints.remove(random_hint_num)
-        return hints
-        
-
-    def validate_guess(self, input_guess: str) -> str:
+    def validate_guess(self, input_guess: str) -> str | Code:
 
         """
 
@@ -261,12 +309,13 @@ class Game:
             
         2.  chars in input_guess should only be digits and digits should only be from 0-7, inclusive
 
-        if input_guess fails any of the above 2 validations, user is prompted again for a new input
+        if input_guess fails any of the above 2 validations, user is prompted again for a new input. keywords are
+        returned as is and valid guesses are returned packed into a Code
 
         Example Arg(s):
             "1234" (str)
         Example Return:
-            "1234" (str)
+            Code('1234') (Code)
             
         """
         valid_guess = False
@@ -274,55 +323,41 @@ class Game:
         while valid_guess == False:
             if input_guess in KEYWORDS:
                 return input_guess
-            elif input_guess == self.ans:
-                return input_guess
+            elif input_guess == str(self.engine.ans):
+                return self.engine.ans
             try:
-                if re.match(r"^[0-7]{%s}$"%(self.digit_count), input_guess):
+                if re.match(r"^[0-7]{%s}$"%(self.engine.digit_count), input_guess):
                     valid_guess = True
-                    validated_guess = input_guess
+                    validated_guess = Code.from_str(input_guess)
                 else:
-                    print(f"\nMASTERMIND: You fool - what do you mean, \"{input_guess}\"?! I demand that you enter {self.digit_count} digits between 0-7, inclusive OR a valid keyword!!\n")
+                    print(f"\nMASTERMIND: You fool - what do you mean, \"{input_guess}\"?! I demand that you enter {self.engine.digit_count} digits between 0-7, inclusive OR a valid keyword!!\n")
                     self.print_turn_intro()
-                    input_guess = input()
+                    with phase("input_wait"):
+                        input_guess = input()
                     continue
-            except BaseException as e:
+            except ValueError as e:
                 pass   
             
         return validated_guess
 
-    def generate_guess_feedback(self, validated_guess: str) -> str | dict[str, int]:
+    def generate_guess_feedback(self, validated_guess: Code, score: tuple[int, int] | None = None) -> str:
 
         """
         
         this function details the core logic behind allocating "correct number," "correct location," or
-        "all incorrect" feedback info to give to user after each validated guess
+        "all incorrect" feedback info to give to user after each validated guess. score can be passed in when
+        the guess has already been scored (e.g. when re-printing the guess history)
         
         Example Arg(s):
-            "1454" (str)
+            Code('1454') (Code)
         Example Return:
             "Feedback for 1454: {'correct number': 2, 'correct location': 2}" (str)
 
         """
 
-        ans = self.ans
-        ans_counter: list = [0,0,0,0,0,0,0,0,0,0]
-        guess_counter: list = [0,0,0,0,0,0,0,0,0,0]
-        ret = {"correct number": 0, "correct location": 0}
+        correct_number, correct_location = self.engine.score_guess(validated_guess) if score is None else score
+        ret = {"correct number": correct_number, "correct location": correct_location}
 
-        for x in range(4):
-            ans_digit = int(ans[x])
-            validated_guess_digit = int(validated_guess[x])
-
-            if ans_digit == validated_guess_digit:
-                ret["correct location"] += 1
-
-            ans_counter[ans_digit] += 1
-            guess_counter[validated_guess_digit] += 1
-
-        for idx in range(10):
-            ret["correct number"] += min(ans_counter[idx], guess_counter[idx])
-        # ret["correct number"] -= ret["correct location"]
-        
         ret = "all incorrect" if ret["correct location"] + ret["correct number"] == 0 else ret
         return f"Feedback for {validated_guess}: {ret}\n"
 
@@ -330,8 +365,8 @@ class Game:
 
         """
         
-        this function handles the /guess_history keyword, printing every string in the guess_history
-        list instance variable, which is a list of guess_feedback strings (one per valid user guess (ln 607))
+        this function handles the /guess_history keyword, printing the feedback of every entry in the guess_history
+        list instance variable, which is a list of (guess, (correct number, correct location)) tuples (one per valid user guess)
 
         Example Arg(s):
             None
@@ -341,16 +376,17 @@ class Game:
         """
 
         print("\n \rGuess History:\n")
-        for idx in range(len(self.guess_history)):
-            print(f"{idx+1}: ",self.guess_history[idx])
+        for idx in range(len(self.engine.guess_history)):
+            guess, score = self.engine.guess_history[idx]
+            print(f"{idx+1}: ",self.generate_guess_feedback(guess, score))
         print("\n \n")
 
     def handle_hint_keyword(self) -> None:
 
         """
         
-        this function handles the /hint keyword, printing a new hint and keeping track of how many hints the user
-        has requested via the hints_idx instance variable (an integer that increments every time the user asks for a hint)
+        this function handles the /hint keyword, printing a new hint from the engine, which keeps track of how many hints the user
+        has requested via its hints_idx instance variable (an integer that increments every time the user asks for a hint)
 
         Example Arg(s):
             None
@@ -359,12 +395,11 @@ class Game:
         
         """
 
-        if self.hints_idx > 2 - self.difficulty:
+        new_hint = self.engine.request_hint()
+        if new_hint is None:
             print("\nMASTERMIND: YOU HAVE NO MORE HINTS!\n")
         else:
-            new_hint = self.hints[self.hints_idx]
-            print(new_hint, "\n")
-            self.hints_idx += 1
+            print(new_hint.description, "\n")
 
 
     def handle_hint_history_keyword(self) -> None:
@@ -381,10 +416,10 @@ class Game:
         
         """
 
-        if self.hints_idx-1 >= 0:
+        if self.engine.hints_idx-1 >= 0:
             print("\nHint History:")
-            for idx in range(self.hints_idx):
-                print(self.hints[idx])
+            for idx in range(self.engine.hints_idx):
+                print(self.engine.hints[idx].description)
             print("\n")
         else:
             print("\nMASTERMIND: Stop this foolishness! You haven't asked for any hints yet; enter the command /hint to ask for a hint.\n")
@@ -439,7 +474,7 @@ class Game:
 
         """
         
-        this function is called when user correctly guesses MASTERMIND's number, which is saved as self.ans.
+        this function is called when user correctly guesses MASTERMIND's number, which is saved as self.engine.ans.
         the function then increments the score in the naive database score.txt file by calling increment_score_in_file().
         it then calls ask_user_replay() to initiate a while loop that asks for a valid user response to replay question (ln 491-502). 
         handle_win_and_ask_replay() will then return True or False depending on whether user does or doesn't want to replay the game
@@ -452,6 +487,7 @@ class Game:
         """
 
         print(WIN_MSG)
+        metrics.record_game_finished(self.difficulty, "win", len(self.engine.guess_history))
         self.increment_score_in_file()
         if self.ask_user_replay() == True:
             return True
@@ -475,7 +511,8 @@ class Game:
 
         while valid_response == False:
             sys.stdout.write("\nPlay again? (y/n): ")
-            replay_response = input()
+            with phase("input_wait"):
+                replay_response = input()
             if replay_response.lower() in ["y", "n", "yes", "no"]:
                 valid_response = True
             else:
@@ -502,8 +539,8 @@ class Game:
 
         print(LINE,"\n")
         print(f"Keywords (try entering one of these during the guess phase): {KEYWORDS}")
-        print("Hints Remaining:", 3 - self.hints_idx - self.difficulty)
-        print("Guesses Remaining:",self.guesses_remaining)
+        print("Hints Remaining:", self.engine.hints_remaining)
+        print("Guesses Remaining:",self.engine.guesses_remaining)
         sys.stdout.write("Guess: ")
 
     def handle_lose_and_ask_replay(self) -> bool:
@@ -522,6 +559,7 @@ class Game:
         """
 
         print(LOSE_MSG)
+        metrics.record_game_finished(self.difficulty, "loss", len(self.engine.guess_history))
         sys.stdout.write(f"\n\rScore: {self.score}\n")
         return True if self.ask_user_replay() == True else False
 
@@ -530,8 +568,8 @@ class Game:
         """
         
         this function runs the main game logic. it initializes a while loop that prints the intro to each new turn,
-        decrements the guesses_remaining instance variable if the user's validated_guess doesn't match the ans instance variable
-        or a user keyword, and handles if the user wins (validated_guess == self.ans) or loses (self.guesses_remaining == 0),
+        handles keywords, submits every other validated_guess to the engine (which scores it and decrements guesses_remaining),
+        and handles if the user wins (validated_guess == self.engine.ans) or loses (self.engine.guesses_remaining == 0),
         asking the user if they want to replay the game after either of those outcomes
 
         Example Arg(s):
@@ -541,15 +579,21 @@ class Game:
 
         """
         
-        while self.guesses_remaining > 0:
-            self.print_turn_intro()
+        while self.engine.guesses_remaining > 0:
+            with phase("render"):
+                self.print_turn_intro()
             try:
-                guess = input()
-                validated_guess = self.validate_guess(guess)
+                with phase("input_wait"):
+                    guess = input()
+                with phase("validate_guess"):
+                    validated_guess = self.validate_guess(guess)
                 if validated_guess in KEYWORDS:
-                    self.handle_keyword(validated_guess)
+                    with phase("handle_keyword"):
+                        self.handle_keyword(validated_guess)
                     continue
-                elif validated_guess == self.ans:
+                with phase("submit"):
+                    result = self.engine.submit(validated_guess)
+                if result.won:
                     if self.handle_win_and_ask_replay() == True:
                         self.refresh_game_attributes(replay=True)
                         continue
@@ -557,11 +601,11 @@ class Game:
                         print("\nMASTERMIND: I'll get you next time!!!")
                         return
                 else:
-                    guess_feedback = self.generate_guess_feedback(validated_guess)
-                    print(guess_feedback)
-                    self.guess_history.append(guess_feedback)
-                    self.guesses_remaining -= 1
-                    if self.guesses_remaining == 0:
+                    with phase("generate_guess_feedback"):
+                        feedback = self.generate_guess_feedback(validated_guess, result.score)
+                    with phase("render"):
+                        print(feedback)
+                    if result.lost:
                         if self.handle_lose_and_ask_replay() == True:
                             self.refresh_game_attributes(replay=True)
                             continue
@@ -1,37 +1,30 @@
-import random
+from code_class import Code
+from entropy_class import ENTROPY
 
 class Hint:
-    def __init__(self, ans: str, hint_num: int=0):
+    def __init__(self, ans: Code, hint_num: int=0, rng=ENTROPY):
         self.hint_num: int = hint_num
-        self.ans: str = ans
+        self.ans: Code = ans
+        self.rng = rng
+        self.value: int = 0
         self.description = self.make_hint()
 
     def make_hint(self) -> str:
         match self.hint_num:
             case 0:
-                return f"\nMASTERMIND: A hint?! Really?! You need a hint?! Fine. The last digit of the number in my head is {self.ans[-1]}"
+                self.value = self.ans.last_digit()
+                return f"\nMASTERMIND: A hint?! Really?! You need a hint?! Fine. The last digit of the number in my head is {self.value}"
             case 1:
-                sum = 0
-                for idx in range(len(self.ans)):
-                    sum += int(self.ans[idx])
-                return f"\nMASTERMIND: FINE. The sum of the digits for the number in my head is {sum}"
+                self.value = self.ans.digit_sum()
+                return f"\nMASTERMIND: FINE. The sum of the digits for the number in my head is {self.value}"
             case 2:
-                less_than_equal_3_count = 0
-                for idx in range(len(self.ans)):
-                    if int(self.ans[idx]) <= 3:
-                        less_than_equal_3_count += 1
-                return f"\nMASTERMIND: There are {less_than_equal_3_count} digits in the number in my head that are less than or equal to 3"
+                self.value = self.ans.count_at_most_3()
+                return f"\nMASTERMIND: There are {self.value} digits in the number in my head that are less than or equal to 3"
             case 3:
-                product = 1
-                for idx in range(len(self.ans)):
-                    product *= int(self.ans[idx])
-                return f"\nMASTERMIND: FINE. The product of the digits for the number in my head is {product}"
+                self.value = self.ans.digit_product()
+                return f"\nMASTERMIND: FINE. The product of the digits for the number in my head is {self.value}"
             case 4:
-                 while True:
-                    hint = str(random.randint(0,7))
-                    if hint not in self.ans:
-                        return f"\nMASTERMIND: {hint} is not a digit in the number I am thinking of"
+                absent_digits = sorted(set(range(8)).difference(self.ans.digits()))
+                self.value = absent_digits[self.rng.randrange(len(absent_digits))]
+                return f"\nMASTERMIND: {self.value} is not a digit in the number I am thinking of"
         return ""
-
-
-
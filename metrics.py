@@ -0,0 +1,265 @@
+import os
+import time
+import atexit
+import threading
+from engine_class import MAX_GUESSES, DIFFICULTY_NAMES
+
+#env variables that turn the exporter on: a local port serving /metrics, and/or a file rewritten every interval
+METRICS_PORT_ENV_VAR="MASTERMIND_METRICS_PORT"
+METRICS_FILE_ENV_VAR="MASTERMIND_METRICS_FILE"
+METRICS_INTERVAL_ENV_VAR="MASTERMIND_METRICS_INTERVAL"
+DEFAULT_METRICS_INTERVAL=15.0
+
+#content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE="text/plain; version=0.0.4; charset=utf-8"
+
+#histogram bucket upper bounds: fetch_answer latency in seconds, and guesses used per finished game
+FETCH_LATENCY_BUCKETS=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+GUESSES_PER_GAME_BUCKETS=list(range(1, MAX_GUESSES + 1))
+
+
+def format_labels(labels: tuple) -> str:
+
+    """
+
+    this function formats a metric's (name, value) label pairs as a Prometheus label set
+
+    Example Arg(s):
+        (("difficulty", "hard"), ("outcome", "win")) (tuple)
+    Example Return:
+        '{difficulty="hard",outcome="win"}' (str)
+
+    """
+
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+class Counter:
+
+    """
+
+    monotonically increasing count per label set, e.g. games started per difficulty. updates and renders hold the
+    counter's lock, as the game thread, prefetch workers and the exporter all touch it
+
+    """
+
+    def __init__(self, name: str, description: str):
+        self.name: str = name
+        self.description: str = description
+        self.values: dict[tuple, float] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float=1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = sorted(self.values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{format_labels(labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+
+    """
+
+    cumulative bucket counts, sum and count of observed values per label set, e.g. guesses used per game. like
+    Counter, every update and render holds the histogram's lock
+
+    """
+
+    def __init__(self, name: str, description: str, buckets: list[float]):
+        self.name: str = name
+        self.description: str = description
+        self.buckets: list[float] = buckets
+        self.values: dict[tuple, list] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][idx] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            values = sorted((labels, (list(bucket_counts), total, count)) for labels, (bucket_counts, total, count) in self.values.items())
+        for labels, (bucket_counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{format_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {total:g}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+        return lines
+
+
+#the game's metrics. they are only updated once per game or per answer fetch, never inside the turn loop
+GAMES_STARTED=Counter("mastermind_games_started_total", "games started, by difficulty")
+GAMES_FINISHED=Counter("mastermind_games_finished_total", "games finished, by difficulty and outcome (win or loss)")
+GUESSES_PER_GAME=Histogram("mastermind_guesses_per_game", "guesses used per finished game, by difficulty and outcome", GUESSES_PER_GAME_BUCKETS)
+FETCH_ANSWER_SECONDS=Histogram("mastermind_fetch_answer_seconds", "latency of fetch_answer(), including any offline fallback", FETCH_LATENCY_BUCKETS)
+FETCH_ANSWER_FAILURES=Counter("mastermind_fetch_answer_failures_total", "answers the answer source failed to provide (by default: RNG API requests that failed)")
+OFFLINE_FALLBACKS=Counter("mastermind_offline_fallbacks_total", "answers generated offline instead of by the RNG API, by difficulty")
+ANSWER_POOL_TAKES=Counter("mastermind_answer_pool_takes_total", "answers requested from the prefetched answer pool, by result (hit or miss)")
+RNG_API_RETRIES=Counter("mastermind_rng_api_retries_total", "RNG API requests retried after a connection error, timeout or retryable status")
+RNG_API_CIRCUIT_TRIPS=Counter("mastermind_rng_api_circuit_trips_total", "times the RNG API circuit breaker opened after consecutive failures")
+RNG_API_SHORT_CIRCUITS=Counter("mastermind_rng_api_short_circuits_total", "RNG API calls refused instantly because the circuit breaker was open")
+METRICS=[GAMES_STARTED, GAMES_FINISHED, GUESSES_PER_GAME, FETCH_ANSWER_SECONDS, FETCH_ANSWER_FAILURES, OFFLINE_FALLBACKS, ANSWER_POOL_TAKES, RNG_API_RETRIES,
+         RNG_API_CIRCUIT_TRIPS, RNG_API_SHORT_CIRCUITS]
+
+
+def record_game_finished(difficulty: int, outcome: str, guesses: int) -> None:
+
+    """
+
+    this function records the end of a game: its outcome ("win" or "loss") and the number of guesses it took
+
+    Example Arg(s):
+        0, "win", 6 (int, str, int)
+    Example Return:
+        None
+
+    """
+
+    GAMES_FINISHED.inc(difficulty=DIFFICULTY_NAMES[difficulty], outcome=outcome)
+    GUESSES_PER_GAME.observe(guesses, difficulty=DIFFICULTY_NAMES[difficulty], outcome=outcome)
+
+
+def render_metrics() -> str:
+
+    """
+
+    this function renders every metric in the Prometheus text exposition format
+
+    Example Arg(s):
+        None
+    Example Return:
+        '# HELP mastermind_games_started_total games started, by difficulty\\n# TYPE ...' (str)
+
+    """
+
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def start_metrics_server(port: int):
+
+    """
+
+    this function serves render_metrics() at /metrics (and /) on a local port from a daemon thread. http.server is
+    imported here so importing this module stays cheap when no port is configured
+
+    Example Arg(s):
+        9464 (int)
+    Example Return:
+        <ThreadingHTTPServer 127.0.0.1:9464> (ThreadingHTTPServer)
+
+    """
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ["/", "/metrics"]:
+                self.send_error(404)
+                return
+            body = render_metrics().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_metrics_file(path: str) -> None:
+
+    """
+
+    this function rewrites the metrics file atomically (write a temporary file, then rename it over the old one), so
+    a collector never reads a half written file
+
+    Example Arg(s):
+        "/var/lib/node_exporter/mastermind.prom" (str)
+    Example Return:
+        None
+
+    """
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
+
+
+def start_metrics_file_writer(path: str, interval: float) -> threading.Thread:
+
+    """
+
+    this function rewrites the metrics file every interval seconds from a daemon thread, and once more at exit
+
+    Example Arg(s):
+        "mastermind.prom", 15.0 (str, float)
+    Example Return:
+        <Thread> (threading.Thread)
+
+    """
+
+    def write_forever():
+        while True:
+            try:
+                write_metrics_file(path)
+            except OSError:
+                pass
+            time.sleep(interval)
+
+    thread = threading.Thread(target=write_forever, daemon=True)
+    thread.start()
+    atexit.register(write_metrics_file, path)
+    return thread
+
+
+def start_exporter_from_env() -> None:
+
+    """
+
+    this function starts the exporters configured by METRICS_PORT_ENV_VAR and METRICS_FILE_ENV_VAR (neither is
+    started when they are unset). an exporter that can't start prints a SYS_MESSAGE and the game goes on without it
+
+    Example Arg(s):
+        None
+    Example Return:
+        None
+
+    """
+
+    port = os.environ.get(METRICS_PORT_ENV_VAR)
+    path = os.environ.get(METRICS_FILE_ENV_VAR)
+    try:
+        if port:
+            start_metrics_server(int(port))
+        if path:
+            start_metrics_file_writer(path, float(os.environ.get(METRICS_INTERVAL_ENV_VAR, DEFAULT_METRICS_INTERVAL)))
+    except (OSError, ValueError) as e:
+        print(f"\rSYS_MESSAGE: metrics exporter not started: {e}\n")
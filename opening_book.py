@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+import struct
+import argparse
+from engine_class import DIFFICULTIES
+
+#file the opening book is written to and loaded from, next to this module
+OPENING_BOOK_PATH=os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+#file layout: header = magic, format version, number of entries; each entry = strategy id, candidate set
+#fingerprint (CandidateSet.fingerprint(), 16 bytes), guess code index. bump the version whenever the layout or the
+#fingerprint changes, older files are then ignored instead of being misread
+OPENING_BOOK_MAGIC=b"MMOB"
+OPENING_BOOK_VERSION=1
+HEADER_FORMAT="<4sHI"
+ENTRY_FORMAT="<B16sI"
+
+#solver names (Solver.name in solver_class.py) and the one byte ids they are stored under
+STRATEGY_IDS={"minimax": 0, "entropy": 1}
+
+#how much search the builder gives each book move, far more than a live move gets since the book is built once
+BUILD_PAIR_EVALUATIONS=64_000_000
+BUILD_TIME_BUDGET=1.0
+
+#book loaded by load_opening_book(), read from disk once per process
+LOADED_BOOK: dict | None = None
+
+
+def write_opening_book(book: dict[str, dict[bytes, int]], path: str=OPENING_BOOK_PATH) -> None:
+
+    """
+
+    this function writes an opening book ({strategy name: {candidate set fingerprint: guess index}}) to disk in the
+    compact versioned binary layout described above ENTRY_FORMAT
+
+    Example Arg(s):
+        {"minimax": {b"...": 9}}, "opening_book.bin" (dict[str, dict[bytes, int]], str)
+    Example Return:
+        None
+
+    """
+
+    entries = [(STRATEGY_IDS[strategy], fingerprint, guess_idx)
+               for strategy, moves in book.items()
+               for fingerprint, guess_idx in moves.items()]
+
+    with open(path, "wb") as f:
+        f.write(struct.pack(HEADER_FORMAT, OPENING_BOOK_MAGIC, OPENING_BOOK_VERSION, len(entries)))
+        for entry in entries:
+            f.write(struct.pack(ENTRY_FORMAT, *entry))
+
+
+def read_opening_book(path: str=OPENING_BOOK_PATH) -> dict[str, dict[bytes, int]]:
+
+    """
+
+    this function reads an opening book from disk. a missing, truncated or wrong version file is treated as an
+    empty book, so solvers always start and simply search for every move themselves
+
+    Example Arg(s):
+        "opening_book.bin" (str)
+    Example Return:
+        {"minimax": {b"...": 9}, "entropy": {b"...": 10}} (dict[str, dict[bytes, int]])
+
+    """
+
+    strategy_names = {strategy_id: strategy for strategy, strategy_id in STRATEGY_IDS.items()}
+    book: dict = {}
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, entry_count = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != OPENING_BOOK_MAGIC or version != OPENING_BOOK_VERSION:
+            return {}
+        offset = struct.calcsize(HEADER_FORMAT)
+        for strategy_id, fingerprint, guess_idx in struct.iter_unpack(ENTRY_FORMAT, data[offset:offset + entry_count * struct.calcsize(ENTRY_FORMAT)]):
+            book.setdefault(strategy_names[strategy_id], {})[fingerprint] = guess_idx
+    except (OSError, struct.error, KeyError):
+        return {}
+
+    return book
+
+
+def load_opening_book() -> dict[str, dict[bytes, int]]:
+
+    """
+
+    this function returns the process wide opening book, reading OPENING_BOOK_PATH on first use
+
+    Example Arg(s):
+        None
+    Example Return:
+        {"minimax": {b"...": 9}, "entropy": {b"...": 10}} (dict[str, dict[bytes, int]])
+
+    """
+
+    global LOADED_BOOK
+    if LOADED_BOOK is None:
+        LOADED_BOOK = read_opening_book()
+    return LOADED_BOOK
+
+
+def build_strategy_book(solver) -> dict[bytes, int]:
+
+    """
+
+    this function computes the book moves of one solver: its first guess on the whole code space and its second
+    guess for every feedback the first guess can receive (except winning outright)
+
+    Example Arg(s):
+        <MinimaxSolver digit_count=4> (Solver)
+    Example Return:
+        {b"...": 9, b"...": 1315, ...} (dict[bytes, int])
+
+    """
+
+    from candidates_class import CandidateSet
+    from feedback_class import decode_outcome
+
+    digit_count = solver.digit_count
+    win_outcome = digit_count * (digit_count + 1) + digit_count
+    moves = {}
+
+    opening = CandidateSet(digit_count)
+    first_guess = solver.next_guess(opening)
+    moves[opening.fingerprint()] = first_guess
+
+    for outcome, bucket_size in enumerate(solver.engine.partition_counts(first_guess)):
+        if bucket_size == 0 or outcome == win_outcome:
+            continue
+        candidates = CandidateSet(digit_count)
+        candidates.update(first_guess, decode_outcome(outcome, digit_count))
+        if len(candidates) > 2:
+            moves[candidates.fingerprint()] = solver.next_guess(candidates)
+
+    return moves
+
+
+def build_opening_book(strategies: list[str], difficulties: list[int]=DIFFICULTIES) -> dict[str, dict[bytes, int]]:
+
+    """
+
+    this function builds the book moves of every requested strategy at every requested difficulty
+
+    Example Arg(s):
+        ["minimax", "entropy"], [0, 1, 2] (list[str], list[int])
+    Example Return:
+        {"minimax": {...}, "entropy": {...}} (dict[str, dict[bytes, int]])
+
+    """
+
+    from solver_class import MinimaxSolver, EntropySolver
+
+    book: dict = {}
+    for strategy in strategies:
+        for difficulty in difficulties:
+            digit_count = 4 + difficulty
+            if strategy == "minimax":
+                solver = MinimaxSolver(digit_count, max_pair_evaluations=BUILD_PAIR_EVALUATIONS, use_opening_book=False)
+            else:
+                solver = EntropySolver(digit_count, time_budget=BUILD_TIME_BUDGET, use_opening_book=False)
+            started = time.perf_counter()
+            moves = build_strategy_book(solver)
+            book.setdefault(strategy, {}).update(moves)
+            print(f"{strategy} difficulty {difficulty}: {len(moves)} book moves in {time.perf_counter() - started:.1f}s")
+    return book
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="precompute the solvers' opening moves for every difficulty")
+    parser.add_argument("--strategy", choices=list(STRATEGY_IDS), action="append", help="strategy to build (default: all)")
+    parser.add_argument("--output", default=OPENING_BOOK_PATH, help="file to write the opening book to")
+    args = parser.parse_args()
+
+    write_opening_book(build_opening_book(args.strategy or list(STRATEGY_IDS)), args.output)
+    sys.stdout.write(f"wrote {args.output}\n")
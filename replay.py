@@ -0,0 +1,227 @@
+import io
+import sys
+import time
+import random
+import pstats
+import argparse
+import builtins
+import cProfile
+from contextlib import redirect_stdout
+from game_class import Game, KEYWORDS
+from code_class import Code
+from rng_class import GameRNG
+from engine_class import DIFFICULTY_NAMES
+
+#transcript tokens replaced, when they are read, by the current answer or by a random guess that is not the answer,
+#so scripted games can be won or lost on purpose whatever answers the seed produces
+ANSWER_TOKEN="{answer}"
+WRONG_TOKEN="{wrong}"
+
+#transcript lines starting with this are comments and are not fed to the game
+COMMENT_PREFIX="#"
+
+#where the game's output goes: discarded, or kept in memory (its size is reported)
+OUTPUT_SINKS=["null", "buffer"]
+
+
+class TranscriptEnd(BaseException):
+
+    """
+
+    raised by the scripted input() once the transcript runs out. it is a BaseException so that run_game()'s
+    "except Exception" retry loop lets it through and the replay stops
+
+    """
+
+
+class NullWriter(io.TextIOBase):
+
+    """
+
+    output sink that discards everything written to it, without the cost of a real /dev/null write per print
+
+    """
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+class ScriptedGame(Game):
+
+    """
+
+    Game driven by a transcript instead of a person: the real interactive code path (input_user_difficulty(),
+    validate_guess(), print_turn_intro(), handle_keyword(), ask_user_replay(), ...) runs unchanged, while the answer
+    and hints of game k come from GameRNG(seed, k) and the score lives in memory instead of score.txt, so a replay is
+    repeatable and touches neither the network nor the disk
+
+    """
+
+    def __init__(self, lines: list[str], seed: int):
+        self.lines = iter(lines)
+        self.seed: int = seed
+        self.rng: GameRNG = GameRNG(seed, stream=1)
+        self.turns: int = 0
+        self.games: int = 0
+        self.scripted_score: int = 0
+        super().__init__(show_ans=False, fast_start=True)
+
+    def scripted_input(self, prompt: str="") -> str:
+
+        """
+
+        this function stands in for input(): it returns the next transcript line, with ANSWER_TOKEN and WRONG_TOKEN
+        filled in, and raises TranscriptEnd when there are none left
+
+        Example Arg(s):
+            None
+        Example Return:
+            "1234" (str)
+
+        """
+
+        try:
+            line = next(self.lines)
+        except StopIteration:
+            raise TranscriptEnd
+        self.turns += 1
+        if line == ANSWER_TOKEN:
+            return str(self.engine.ans)
+        if line == WRONG_TOKEN:
+            digit_count = self.engine.digit_count
+            wrong = self.rng.randrange(8 ** digit_count - 1)
+            return format(wrong + (wrong >= self.engine.ans.index), "o").zfill(digit_count)
+        return line
+
+    def prefetch_answers(self) -> None:
+        pass
+
+    def fetch_answer(self) -> Code:
+        self.engine.rng = GameRNG(self.seed, self.games)
+        self.games += 1
+        return self.engine.generate_offline_ans(self.difficulty, self.engine.rng)
+
+    def read_score_from_file(self) -> int:
+        return self.scripted_score
+
+    def increment_score_in_file(self) -> None:
+        self.score += 1
+        self.scripted_score = self.score
+        sys.stdout.write(f"\n\rScore: {self.score}\n")
+
+
+def read_transcript(path: str) -> list[str]:
+
+    """
+
+    this function reads a transcript: one input per line, exactly as a user would type it (blank lines are empty
+    inputs), skipping comment lines
+
+    Example Arg(s):
+        "transcript.txt" (str)
+    Example Return:
+        ["hard", "/hint", "0123", "{answer}", "n"] (list[str])
+
+    """
+
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if not line.startswith(COMMENT_PREFIX)]
+
+
+def make_transcript(games: int, seed: int) -> list[str]:
+
+    """
+
+    this function generates a transcript of games that exercises every prompt: a difficulty (sometimes after an invalid
+    one), misses, keywords and invalid guesses, then either a win or a loss, answered with a replay ("y", or "n" after
+    the last game)
+
+    Example Arg(s):
+        1, 0 (int, int)
+    Example Return:
+        ["harder", "{wrong}", "/hint", "{wrong}", "12", "/guess_history", "{answer}", "n"] (list[str])
+
+    """
+
+    rng = random.Random(seed)
+    lines = []
+    for game in range(games):
+        if rng.random() < 0.1:
+            lines.append("easy")
+        lines.append(DIFFICULTY_NAMES[rng.randrange(len(DIFFICULTY_NAMES))])
+        misses = rng.randrange(1, 11)
+        for _ in range(misses):
+            while rng.random() < 0.3:
+                lines.append(rng.choice(KEYWORDS) if rng.random() < 0.8 else "12")
+            lines.append(WRONG_TOKEN)
+        if misses < 10:
+            lines.append(ANSWER_TOKEN)
+        lines.append("y" if game < games - 1 else "n")
+    return lines
+
+
+def replay(lines: list[str], seed: int, sink: str) -> dict:
+
+    """
+
+    this function plays a transcript through ScriptedGame at full speed with the game's output redirected to the
+    sink, and returns the replay's tallies and timing
+
+    Example Arg(s):
+        ["hard", "{answer}", "n"], 0, "null" (list[str], int, str)
+    Example Return:
+        {"turns": 3, "games": 1, "seconds": 0.0004, "output_bytes": 0, "finished": True} (dict)
+
+    """
+
+    out = io.StringIO() if sink == "buffer" else NullWriter()
+    game = ScriptedGame.__new__(ScriptedGame)
+    real_input = builtins.input
+    finished = True
+
+    started = time.perf_counter()
+    try:
+        builtins.input = lambda prompt="": game.scripted_input(prompt)
+        with redirect_stdout(out):
+            game.__init__(lines, seed)
+    except TranscriptEnd:
+        finished = False
+    finally:
+        builtins.input = real_input
+    elapsed = time.perf_counter() - started
+
+    return {"turns": game.turns, "games": game.games, "seconds": elapsed,
+            "output_bytes": len(out.getvalue().encode()) if sink == "buffer" else 0, "finished": finished}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="replay a transcript of user inputs through the interactive game at full speed")
+    parser.add_argument("transcript", nargs="?", help="file with one input per line (default: generate one with --games)")
+    parser.add_argument("--games", type=int, default=1000, help="games in the generated transcript")
+    parser.add_argument("--write-transcript", help="write the generated transcript to this file and exit")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the answers, wrong guesses and the generated transcript")
+    parser.add_argument("--sink", choices=OUTPUT_SINKS, default="null", help="where the game's output goes")
+    parser.add_argument("--profile", action="store_true", help="profile the replay and print the top functions by cumulative time")
+    args = parser.parse_args()
+
+    lines = read_transcript(args.transcript) if args.transcript else make_transcript(args.games, args.seed)
+    if args.write_transcript:
+        with open(args.write_transcript, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        sys.exit(0)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    stats = replay(lines, args.seed, args.sink)
+    if profiler:
+        profiler.disable()
+
+    sys.stdout.write(f"{stats['turns']} turns, {stats['games']} games in {stats['seconds']:.2f}s: "
+                     f"{stats['turns'] / stats['seconds']:,.0f} turns/s, {1e6 * stats['seconds'] / max(stats['turns'], 1):.1f} us/turn\n")
+    if args.sink == "buffer":
+        sys.stdout.write(f"{stats['output_bytes']:,} bytes of output\n")
+    if not stats["finished"]:
+        sys.stdout.write("transcript ran out before the game ended\n")
+    if profiler:
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
@@ -0,0 +1,100 @@
+#64 bit arithmetic mask and the golden ratio increment of SplitMix64
+MASK_64=(1 << 64) - 1
+GOLDEN_GAMMA=0x9E3779B97F4A7C15
+
+
+def splitmix64(x: int) -> int:
+
+    """
+
+    this function is the SplitMix64 finalizer: it scrambles a 64 bit integer into a statistically independent looking
+    64 bit integer, so mixing consecutive counters gives a stream of random numbers
+
+    Example Arg(s):
+        1 (int)
+    Example Return:
+        10451216379200822465 (int)
+
+    """
+
+    x = (x + GOLDEN_GAMMA) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return x ^ (x >> 31)
+
+
+class GameRNG:
+
+    """
+
+    counter based random number generator: draw i of game k in stream s of seed is splitmix64(key + i * GOLDEN_GAMMA)
+    where key is mixed from (seed, stream, game), so any game's numbers are computed directly, without generating the
+    games before it and without hidden state shared between processes. it offers the randint() and randrange() methods
+    of python's random module that the game uses, so either can be passed wherever the game draws random numbers
+
+    """
+
+    def __init__(self, seed: int, game: int=0, stream: int=0):
+        self.seed: int = seed
+        self.game: int = game
+        self.stream: int = stream
+        self.key: int = splitmix64((splitmix64((splitmix64(seed & MASK_64) + stream * GOLDEN_GAMMA) & MASK_64) + game * GOLDEN_GAMMA) & MASK_64)
+        self.counter: int = 0
+
+    def __repr__(self) -> str:
+        return f"GameRNG(seed={self.seed}, game={self.game}, stream={self.stream})"
+
+    def next_u64(self) -> int:
+
+        """
+
+        this function returns the next 64 bit random integer of the stream and advances its counter
+
+        Example Arg(s):
+            None
+        Example Return:
+            920862675595841680 (int)
+
+        """
+
+        self.counter += 1
+        return splitmix64((self.key + self.counter * GOLDEN_GAMMA) & MASK_64)
+
+    def randrange(self, n: int) -> int:
+
+        """
+
+        this function returns a uniformly random integer in [0, n). power of two ranges (like the 8 digit values) take
+        the top bits of one draw, other ranges reject the draws above the largest multiple of n to stay unbiased
+
+        Example Arg(s):
+            8 (int)
+        Example Return:
+            5 (int)
+
+        """
+
+        if n <= 0:
+            raise ValueError(f"empty range for randrange({n})")
+        if n & (n - 1) == 0:
+            return self.next_u64() >> (65 - n.bit_length())
+        limit = (1 << 64) - (1 << 64) % n
+        while True:
+            x = self.next_u64()
+            if x < limit:
+                return x % n
+
+    def randint(self, a: int, b: int) -> int:
+
+        """
+
+        this function returns a uniformly random integer in [a, b], both included, like random.randint()
+
+        Example Arg(s):
+            0, 7 (int, int)
+        Example Return:
+            3 (int)
+
+        """
+
+        return a + self.randrange(b - a + 1)
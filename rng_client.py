@@ -0,0 +1,303 @@
+import time
+import random
+import threading
+import metrics
+
+#connect / read timeouts (seconds) of one request to the RNG API, and the deadline of a whole call including its
+#retries. a call to get_with_retries() ends within its deadline plus, at worst, one read that was already waiting
+#on the socket when the deadline passed (each read waits at most READ_TIMEOUT, or the time left if that's shorter)
+CONNECT_TIMEOUT=2.0
+READ_TIMEOUT=4.0
+REQUEST_DEADLINE=6.0
+
+#keep-alive connection pool of the shared session: hosts kept, and connections kept per host (the speculative
+#prefetch of all 3 difficulties plus an answer pool refill can be in flight at once)
+POOL_CONNECTIONS=2
+POOL_MAXSIZE=8
+
+#attempts per call, and the full jitter exponential backoff between them (a random sleep up to base * 2^retry,
+#capped at max)
+MAX_ATTEMPTS=3
+RETRY_BASE_DELAY=0.1
+RETRY_MAX_DELAY=1.0
+
+#process wide retry budget: every call deposits RETRY_BUDGET_RATIO of a token, every retry spends a whole one, and the
+#budget holds at most RETRY_BUDGET_MAX tokens, so a failing API sees at most ~20% extra requests instead of 3x
+RETRY_BUDGET_RATIO=0.2
+RETRY_BUDGET_MAX=10.0
+
+#HTTP statuses worth retrying: rate limiting and server side errors
+RETRY_STATUSES={429, 500, 502, 503, 504}
+
+#most bytes of the body read at once (read1 returns whatever has arrived, up to this) between deadline checks
+READ_CHUNK_SIZE=4096
+
+#circuit breaker: after this many consecutive failed calls the API is considered down, every call fails instantly
+#(so the game serves offline answers without waiting), and a background thread probes the API every cool-down,
+#doubling up to the max, until a probe succeeds and the breaker closes again
+BREAKER_FAILURE_THRESHOLD=3
+BREAKER_COOL_DOWN=15.0
+BREAKER_MAX_COOL_DOWN=120.0
+BREAKER_PROBE_DEADLINE=3.0
+
+#session shared by every RNG API request, created by get_session() on first use
+SESSION = None
+SESSION_LOCK=threading.Lock()
+
+
+class RetryBudget:
+
+    """
+
+    token bucket that limits retries to a fraction of calls across the whole process
+
+    """
+
+    def __init__(self, ratio: float=RETRY_BUDGET_RATIO, max_tokens: float=RETRY_BUDGET_MAX):
+        self.ratio: float = ratio
+        self.max_tokens: float = max_tokens
+        self.tokens: float = max_tokens
+        self.lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self.lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+RETRY_BUDGET=RetryBudget()
+
+
+class CircuitOpenError(Exception):
+
+    """
+
+    raised instead of calling the RNG API while the circuit breaker is open
+
+    """
+
+
+class CircuitBreaker:
+
+    """
+
+    trips (opens) after BREAKER_FAILURE_THRESHOLD consecutive failed calls. while open, allow() refuses every call,
+    and a background thread probes the API with the request that tripped it, every cool-down (doubling after each
+    failed probe), until one succeeds and closes the breaker. a call never waits on the probing
+
+    """
+
+    def __init__(self, failure_threshold: int=BREAKER_FAILURE_THRESHOLD, cool_down: float=BREAKER_COOL_DOWN):
+        self.failure_threshold: int = failure_threshold
+        self.cool_down: float = cool_down
+        self.consecutive_failures: int = 0
+        self.open: bool = False
+        self.last_error: BaseException | None = None
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            return not self.open
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.consecutive_failures = 0
+
+    def record_failure(self, error: BaseException, url: str, params: dict) -> None:
+
+        """
+
+        this function counts a failed call and trips the breaker once failure_threshold calls in a row have failed,
+        starting the background probe with the failed call's url and params
+
+        Example Arg(s):
+            ConnectionError(...), "https://www.random.org/integers/", {"num": 4, ...} (BaseException, str, dict)
+        Example Return:
+            None
+
+        """
+
+        with self.lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.open or self.consecutive_failures < self.failure_threshold:
+                return
+            self.open = True
+        metrics.RNG_API_CIRCUIT_TRIPS.inc()
+        threading.Thread(target=self.probe, args=(url, params), daemon=True).start()
+
+    def probe(self, url: str, params: dict) -> None:
+
+        """
+
+        this function runs on the probe thread: it sleeps for the cool-down, retries the request once (no retries, a
+        short deadline), and closes the breaker on success, doubling the cool-down up to BREAKER_MAX_COOL_DOWN after
+        every failure
+
+        Example Arg(s):
+            "https://www.random.org/integers/", {"num": 4, ...} (str, dict)
+        Example Return:
+            None
+
+        """
+
+        cool_down = self.cool_down
+        while True:
+            time.sleep(cool_down)
+            try:
+                send_request(url, params, BREAKER_PROBE_DEADLINE, max_attempts=1)
+            except Exception as e:
+                with self.lock:
+                    self.last_error = e
+                cool_down = min(BREAKER_MAX_COOL_DOWN, cool_down * 2)
+                continue
+            with self.lock:
+                self.open = False
+                self.consecutive_failures = 0
+                self.last_error = None
+            return
+
+
+CIRCUIT_BREAKER=CircuitBreaker()
+
+
+def get_session():
+
+    """
+
+    this function returns the process wide keep-alive requests.Session, creating it (and importing requests) on
+    first use. its adapters keep POOL_MAXSIZE connections per host and never retry on their own, get_with_retries()
+    does that within its deadline
+
+    Example Arg(s):
+        None
+    Example Return:
+        <requests.Session> (requests.Session)
+
+    """
+
+    global SESSION
+    with SESSION_LOCK:
+        if SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            SESSION = session
+    return SESSION
+
+
+def read_body(response, deadline: float) -> str:
+
+    """
+
+    this function reads a streamed response body, raising requests.Timeout once the deadline (time.monotonic())
+    passes, so a server that drips its body slowly can't stretch a call past its deadline. the body is decoded per its
+    Content-Encoding (gzip, deflate) as it's read, like requests does. a body cut off before its Content-Length or
+    that fails to decompress raises requests.ConnectionError (a read timeout, requests.Timeout), like the request
+    itself would
+
+    Example Arg(s):
+        <Response [200]>, 1234.5 (requests.Response, float)
+    Example Return:
+        "4\\n0\\n1\\n7\\n" (str)
+
+    """
+
+    import requests
+    from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+
+    raw = response.raw
+    read = raw.read1 if hasattr(raw, "read1") else raw.read
+    chunks = []
+    while True:
+        try:
+            chunk = read(READ_CHUNK_SIZE, decode_content=True)
+        except ReadTimeoutError as e:
+            raise requests.Timeout(e)
+        except (ProtocolError, DecodeError) as e:
+            raise requests.ConnectionError(e)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if time.monotonic() > deadline:
+            raise requests.Timeout("RNG API response body took longer than the request deadline")
+    return b"".join(chunks).decode(response.encoding or "utf-8")
+
+
+def get_with_retries(url: str, params: dict, deadline: float=REQUEST_DEADLINE) -> str:
+
+    """
+
+    this function GETs url with params through the circuit breaker and returns the response body. while the breaker
+    is open it raises CircuitOpenError right away, otherwise see send_request()
+
+    Example Arg(s):
+        "https://www.random.org/integers/", {"num": 4, "min": 0, "max": 7, ...}, 6.0 (str, dict, float)
+    Example Return:
+        "4\\n0\\n1\\n7\\n" (str)
+
+    """
+
+    if not CIRCUIT_BREAKER.allow():
+        metrics.RNG_API_SHORT_CIRCUITS.inc()
+        raise CircuitOpenError(f"RNG API is down ({CIRCUIT_BREAKER.last_error}), checking on it in the background")
+    try:
+        body = send_request(url, params, deadline)
+    except Exception as e:
+        CIRCUIT_BREAKER.record_failure(e, url, params)
+        raise
+    CIRCUIT_BREAKER.record_success()
+    return body
+
+
+def send_request(url: str, params: dict, deadline: float=REQUEST_DEADLINE, max_attempts: int=MAX_ATTEMPTS) -> str:
+
+    """
+
+    this function GETs url with params on the shared session and returns the response body. connection errors,
+    timeouts and RETRY_STATUSES are retried (at most max_attempts attempts, with full jitter backoff, while the
+    retry budget allows), and every attempt's timeouts are clamped to the time left before the deadline (see
+    REQUEST_DEADLINE for the exact bound). raises the last error when no attempt succeeds
+
+    Example Arg(s):
+        "https://www.random.org/integers/", {"num": 4, "min": 0, "max": 7, ...}, 6.0, 3 (str, dict, float, int)
+    Example Return:
+        "4\\n0\\n1\\n7\\n" (str)
+
+    """
+
+    import requests
+
+    session = get_session()
+    give_up_at = time.monotonic() + deadline
+    RETRY_BUDGET.deposit()
+
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = give_up_at - time.monotonic()
+        try:
+            if remaining <= 0:
+                raise requests.Timeout(f"RNG API request deadline of {deadline}s exceeded")
+            with session.get(url, params=params, timeout=(min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)), stream=True) as response:
+                if response.status_code in RETRY_STATUSES:
+                    raise requests.HTTPError(f"{response.status_code} from RNG API", response=response)
+                response.raise_for_status()
+                return read_body(response, give_up_at)
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            retryable = not isinstance(e, requests.HTTPError) or (e.response is not None and e.response.status_code in RETRY_STATUSES)
+            backoff = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            if not retryable or attempt >= max_attempts or time.monotonic() + backoff >= give_up_at or not RETRY_BUDGET.withdraw():
+                raise
+            metrics.RNG_API_RETRIES.inc()
+            time.sleep(backoff)
@@ -0,0 +1,45 @@
+import os
+import json
+
+#RNG API used when neither the environment nor .env sets RNG_URL
+DEFAULT_RNG_URL="https://www.random.org/integers/"
+
+#env variables holding the RNG API parameters of each difficulty level (JSON objects)
+RNG_PARAMS_ENV_VARS={0: "RNG_PARAMS_FOR_DIFFICULTY_LEVEL_ZERO", 1: "RNG_PARAMS_FOR_DIFFICULTY_LEVEL_ONE", 2: "RNG_PARAMS_FOR_DIFFICULTY_LEVEL_TWO"}
+
+#RNG API url and parameters per difficulty level, loaded by load_rng_config() the first time an answer is fetched
+#(dotenv is imported then too), so importing the game for offline or headless use stays cheap
+RNG_CONFIG: dict | None = None
+
+
+def load_rng_config() -> dict:
+
+    """
+
+    this function returns the process wide RNG API configuration, loading .env (when python-dotenv is installed) and
+    parsing the RNG env variables on first use. a missing or malformed parameter blob falls back to the parameters
+    that ask the API for 4 + difficulty digits between 0-7, so the game runs without a .env file
+
+    Example Arg(s):
+        None
+    Example Return:
+        {"url": "https://www.random.org/integers/", "params": {0: {"num": 4, ...}, 1: {...}, 2: {...}}} (dict)
+
+    """
+
+    global RNG_CONFIG
+    if RNG_CONFIG is None:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+
+        params = {}
+        for difficulty, env_var in RNG_PARAMS_ENV_VARS.items():
+            try:
+                params[difficulty] = json.loads(os.environ[env_var])
+            except (KeyError, ValueError):
+                params[difficulty] = {"num": 4 + difficulty, "min": 0, "max": 7, "col": 1, "base": 10, "format": "plain", "rnd": "new"}
+        RNG_CONFIG = {"url": os.environ.get("RNG_URL", DEFAULT_RNG_URL), "params": params}
+    return RNG_CONFIG
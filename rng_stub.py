@@ -0,0 +1,309 @@
+import sys
+import math
+import time
+import random
+import socket
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+#random.org's /integers/ limits: at most this many numbers per request, and numbers within +-1e9
+MAX_NUMBERS=10_000
+MAX_ABS_VALUE=1_000_000_000
+BASES={2: "b", 8: "o", 10: "d", 16: "x"}
+
+#latency distributions the stub can add before answering: "none", "fixed:S", "uniform:LOW:HIGH", "exp:MEAN" or
+#"lognormal:MEDIAN:SIGMA", all in seconds
+LATENCY_KINDS=["none", "fixed", "uniform", "exp", "lognormal"]
+
+#percentiles reported by the load driver
+LOAD_PERCENTILES=[50, 90, 99, 99.9]
+
+
+def parse_latency(spec: str):
+
+    """
+
+    this function turns a latency spec (see LATENCY_KINDS) into a function that draws one delay (seconds) from an rng
+
+    Example Arg(s):
+        "lognormal:0.12:0.5" (str)
+    Example Return:
+        <function> (Callable[[random.Random], float])
+
+    """
+
+    kind, *args = spec.split(":")
+    values = [float(arg) for arg in args]
+    if kind == "none" and not values:
+        return lambda rng: 0.0
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"bad latency spec {spec!r}, expected one of {LATENCY_KINDS} with its parameters")
+
+
+def render_integers(params: dict, rng: random.Random) -> str:
+
+    """
+
+    this function answers an /integers/ query like random.org does for format=plain: "num" random integers between
+    "min" and "max", "col" per line (tab separated), written in "base". raises ValueError for a query random.org
+    would reject
+
+    Example Arg(s):
+        {"num": ["4"], "min": ["0"], "max": ["7"], "col": ["1"], "base": ["10"], "format": ["plain"]}, <random.Random> (dict, random.Random)
+    Example Return:
+        "4\\n0\\n1\\n7\\n" (str)
+
+    """
+
+    try:
+        num = int(params["num"][0])
+        low = int(params["min"][0])
+        high = int(params["max"][0])
+        col = int(params.get("col", ["1"])[0])
+        base = int(params.get("base", ["10"])[0])
+    except (KeyError, ValueError):
+        raise ValueError("num, min and max are required integers")
+    if not 1 <= num <= MAX_NUMBERS:
+        raise ValueError(f"num must be between 1 and {MAX_NUMBERS}")
+    if not -MAX_ABS_VALUE <= low <= high <= MAX_ABS_VALUE:
+        raise ValueError("min must be at most max, both within +-1e9")
+    if col < 1 or base not in BASES:
+        raise ValueError(f"col must be positive and base one of {sorted(BASES)}")
+    if params.get("format", ["plain"])[0] != "plain":
+        raise ValueError("only format=plain is supported")
+
+    numbers = [format(rng.randint(low, high), BASES[base]) for _ in range(num)]
+    return "".join("\t".join(numbers[idx:idx + col]) + "\n" for idx in range(0, num, col))
+
+
+class StubRNGHandler(BaseHTTPRequestHandler):
+
+    """
+
+    stands in for the random.org /integers/ endpoint (the contract of the RNG_PARAMS_FOR_DIFFICULTY_LEVEL_* settings
+    in .env). the server it runs on may inject faults: latency drawn from server.latency, 503 errors, truncated bodies
+    and dropped connections, each with its own rate
+
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            delay = server.latency(server.rng)
+            fault = server.rng.random()
+            body_rng = random.Random(server.rng.getrandbits(64))
+        if delay > 0:
+            time.sleep(delay)
+
+        if fault < server.drop_rate:
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        fault -= server.drop_rate
+        if fault < server.error_rate:
+            self.send_text(503, "Error: The server is temporarily overloaded (injected)\n")
+            return
+        fault -= server.error_rate
+
+        if url.path.rstrip("/") != "/integers":
+            self.send_text(404, "Error: only /integers/ is served\n")
+            return
+        try:
+            body = render_integers(parse_qs(url.query), body_rng)
+        except ValueError as e:
+            self.send_text(400, f"Error: {e}\n")
+            return
+
+        if fault < server.truncate_rate:
+            payload = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload[:len(payload) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        self.send_text(200, body)
+
+    def send_text(self, status: int, text: str) -> None:
+        payload = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubRNGServer(ThreadingHTTPServer):
+
+    """
+
+    threaded HTTP server for StubRNGHandler that doesn't print a traceback every time a client resets a connection,
+    which clients under injected faults do all the time
+
+    """
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_stub_rng_server(port: int=0, latency: str="none", error_rate: float=0.0, truncate_rate: float=0.0,
+                          drop_rate: float=0.0, seed: int | None=None) -> StubRNGServer:
+
+    """
+
+    this function starts the stub RNG endpoint on a local port (0 picks a free one) in a background thread, with the
+    given latency spec and fault rates (fractions of requests)
+
+    Example Arg(s):
+        0, "lognormal:0.12:0.5", 0.05, 0.01, 0.01, 7 (int, str, float, float, float, int | None)
+    Example Return:
+        <StubRNGServer 127.0.0.1:53211> (StubRNGServer)
+
+    """
+
+    server = StubRNGServer(("127.0.0.1", port), StubRNGHandler)
+    server.latency = parse_latency(latency)
+    server.error_rate = error_rate
+    server.truncate_rate = truncate_rate
+    server.drop_rate = drop_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_load(url: str, requests: int, concurrency: int, num: int, use_breaker: bool) -> dict:
+
+    """
+
+    this function fires requests /integers/ calls at url from concurrency threads through the game's fetch path
+    (rng_client.py: shared session, timeouts, retries and, with use_breaker, the circuit breaker) and returns the
+    latency of every call plus the outcome counts
+
+    Example Arg(s):
+        "http://127.0.0.1:53211/integers/", 1000, 8, 4, True (str, int, int, int, bool)
+    Example Return:
+        {"seconds": 2.1, "latencies": [0.012, ...], "outcomes": {"ok": 990, "ConnectionError": 10}} (dict)
+
+    """
+
+    import rng_client
+
+    params = {"num": num, "min": 0, "max": 7, "col": 1, "base": 10, "format": "plain", "rnd": "new"}
+    fetch = rng_client.get_with_retries if use_breaker else rng_client.send_request
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    latencies = []
+    outcomes = Counter()
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            started = time.perf_counter()
+            try:
+                body = fetch(url, params)
+                outcome = "ok" if len(body.split()) == num else "short body"
+            except Exception as e:
+                outcome = type(e).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                outcomes[outcome] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"seconds": time.perf_counter() - started, "latencies": latencies, "outcomes": dict(outcomes)}
+
+
+def format_load_report(report: dict) -> str:
+
+    """
+
+    this function formats a run_load() report: throughput, latency percentiles and outcome counts (or just the
+    duration, for a run that made no calls)
+
+    Example Arg(s):
+        {"seconds": 2.1, "latencies": [...], "outcomes": {"ok": 990, "ConnectionError": 10}} (dict)
+    Example Return:
+        "1000 calls in 2.10s: 476 calls/s\\nlatency ms: p50 12.1  p90 30.4 ...\\noutcomes: ok 990, ConnectionError 10" (str)
+
+    """
+
+    latencies = sorted(report["latencies"])
+    calls = len(latencies)
+    if not calls:
+        return f"no calls in {report['seconds']:.2f}s"
+    percentiles = "  ".join(f"p{p:g} {1000 * latencies[min(calls - 1, int(p / 100 * calls))]:.1f}" for p in LOAD_PERCENTILES)
+    outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(report["outcomes"].items(), key=lambda item: -item[1]))
+    return (f"{calls} calls in {report['seconds']:.2f}s: {calls / report['seconds']:,.0f} calls/s\n"
+            f"latency ms: {percentiles}  max {1000 * latencies[-1]:.1f}\n"
+            f"outcomes: {outcomes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="local stand-in for the random.org /integers/ API with latency and fault injection, plus a load driver")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in [("serve", "run the stub server until interrupted"), ("load", "drive load through the game's fetch path and report latency")]:
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument("--port", type=int, default=8765 if command == "serve" else 0, help="port to serve on (0 = any free port)")
+        sub.add_argument("--latency", default="none", help=f"latency spec, one of {LATENCY_KINDS}, e.g. lognormal:0.12:0.5")
+        sub.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+        sub.add_argument("--truncate-rate", type=float, default=0.0, help="fraction of responses cut off halfway")
+        sub.add_argument("--drop-rate", type=float, default=0.0, help="fraction of connections closed without a response")
+        sub.add_argument("--seed", type=int, default=None, help="seed for the latencies, faults and numbers")
+    load = subparsers.choices["load"]
+    load.add_argument("--url", help="endpoint to load (default: a stub started in this process with the options above)")
+    load.add_argument("--requests", type=int, default=1000, help="calls to make")
+    load.add_argument("--concurrency", type=int, default=8, help="threads making calls")
+    load.add_argument("--num", type=int, default=4, help="digits requested per call")
+    load.add_argument("--no-breaker", action="store_true", help="bypass the circuit breaker (retries and timeouts still apply)")
+    args = parser.parse_args()
+    if args.command == "load" and (args.requests < 1 or args.concurrency < 1):
+        parser.error("--requests and --concurrency must be at least 1")
+
+    server = None
+    if args.command == "serve" or not args.url:
+        server = start_stub_rng_server(args.port, args.latency, args.error_rate, args.truncate_rate, args.drop_rate, args.seed)
+        url = f"http://127.0.0.1:{server.server_address[1]}/integers/"
+
+    if args.command == "serve":
+        sys.stdout.write(f"serving {url} (set RNG_URL to use it), ctrl + C to stop\n")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = run_load(args.url or url, args.requests, args.concurrency, args.num, not args.no_breaker)
+        sys.stdout.write(format_load_report(report) + "\n")
+    if server is not None:
+        server.shutdown()
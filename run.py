@@ -1,3 +1,16 @@
+import time
+#fallback start of the startup latency report where the OS doesn't tell when the process started (timing.process_age())
+INTERPRETER_START=time.perf_counter()
+
+import os
+import sys
+import metrics
 from game_class import Game
 
-g = Game(show_ans=True)
+#fast start (no welcome animation pauses, no clear subprocesses) can be turned on with --fast-start or MASTERMIND_FAST_START=1
+fast_start = "--fast-start" in sys.argv[1:] or os.environ.get("MASTERMIND_FAST_START", "0").lower() not in ["", "0", "false", "no"]
+
+#serves or writes Prometheus metrics when MASTERMIND_METRICS_PORT or MASTERMIND_METRICS_FILE is set
+metrics.start_exporter_from_env()
+
+g = Game(show_ans=True, fast_start=fast_start, started_at=INTERPRETER_START)
@@ -0,0 +1,289 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from code_class import Code
+from rng_class import GameRNG
+from engine_class import GameEngine, MAX_GUESSES, DIFFICULTY_NAMES
+from feedback_class import get_engine
+
+#strategies a simulated player can use to pick its guesses
+STRATEGIES=["random", "consistent", "minimax", "entropy"]
+
+#where simulated answers come from: GameEngine's offline generator (drawing from each game's GameRNG) or numpy's
+#generator in bulk, one batch per task
+ANSWER_SOURCES=["offline", "numpy"]
+
+#number of games one worker task plays before reporting back, so progress streams while the pool keeps every core busy
+GAMES_PER_TASK=2000
+
+#solvers built by a worker process, one per (strategy, digit count), reused by every task the worker runs
+WORKER_SOLVERS: dict = {}
+
+
+def game_rngs(seed: int, difficulty: int, game: int) -> tuple[GameRNG, GameRNG]:
+
+    """
+
+    this function returns the two counter based generators of one simulated game, derived directly from (seed,
+    difficulty, game number): the engine's, which draws the answer and the hints, and the player's, which draws its
+    guesses. keeping them apart makes a game's answer the same whichever strategy plays it
+
+    Example Arg(s):
+        7, 0, 12 (int, int, int)
+    Example Return:
+        (GameRNG(seed=7, game=12, stream=0), GameRNG(seed=7, game=12, stream=1)) (tuple[GameRNG, GameRNG])
+
+    """
+
+    return GameRNG(seed, game, stream=2 * difficulty), GameRNG(seed, game, stream=2 * difficulty + 1)
+
+
+def make_numpy_answers(difficulty: int, start: int, games: int, seed: int) -> list[Code]:
+
+    """
+
+    this function generates the answers of a task's games (game numbers start to start + games - 1) in bulk with
+    numpy, seeded by (seed, difficulty, start) so that every run with the same --seed plays the same games
+
+    Example Arg(s):
+        0, 0, 3, 7 (int, int, int, int)
+    Example Return:
+        [Code('1234'), Code('0701'), Code('5563')] (list[Code])
+
+    """
+
+    digit_count = 4 + difficulty
+    rng = np.random.default_rng([seed, difficulty, start])
+    return [Code.from_index(int(idx), digit_count) for idx in rng.integers(0, 8 ** digit_count, size=games)]
+
+
+def pick_guess(engine: GameEngine, strategy: str, rng: GameRNG) -> Code:
+
+    """
+
+    this function picks the simulated player's next guess for the engine's current game
+
+    Example Arg(s):
+        <GameEngine>, "consistent", GameRNG(seed=7, game=12, stream=1) (GameEngine, str, GameRNG)
+    Example Return:
+        Code('1234') (Code)
+
+    """
+
+    digit_count = engine.digit_count
+    if strategy == "random":
+        return Code.from_index(rng.randrange(8 ** digit_count), digit_count)
+    if strategy == "consistent":
+        candidates = engine.candidates
+        if candidates.idxs is None:
+            return Code.from_index(rng.randrange(candidates.num_codes), digit_count)
+        return Code.from_index(int(candidates.idxs[rng.randrange(len(candidates))]), digit_count)
+
+    solver = WORKER_SOLVERS.get((strategy, digit_count))
+    if solver is None:
+        from solver_class import MinimaxSolver, EntropySolver, ENTROPY_PAIR_BUDGET
+        if strategy == "minimax":
+            solver = MinimaxSolver(digit_count)
+        else:
+            #a pair budget instead of the wall clock one, so --replay-game picks the same guesses as the simulation
+            solver = EntropySolver(digit_count, pair_budget=ENTROPY_PAIR_BUDGET)
+        WORKER_SOLVERS[(strategy, digit_count)] = solver
+    return Code.from_index(solver.next_guess(engine.candidates), digit_count)
+
+
+def play_game(engine: GameEngine, difficulty: int, strategy: str, answer_source: str, game: int, seed: int, use_hints: bool,
+              numpy_answer: Code | None=None) -> int:
+
+    """
+
+    this function plays simulated game number game of a difficulty to the end on the engine and returns the number of
+    hints requested. with use_hints the player asks for every hint at the start of the game and uses them to narrow its
+    candidates. numpy_answer is the game's answer from make_numpy_answers() when answer_source is "numpy"
+
+    Example Arg(s):
+        <GameEngine>, 0, "consistent", "offline", 12, 7, False (GameEngine, int, str, str, int, int, bool)
+    Example Return:
+        0 (int)
+
+    """
+
+    game_rng, player_rng = game_rngs(seed, difficulty, game)
+    engine.new_game(difficulty, answer=numpy_answer if answer_source == "numpy" else None, rng=game_rng)
+    hints = 0
+    if use_hints:
+        hint = engine.request_hint()
+        while hint is not None:
+            hints += 1
+            if engine.candidates is not None:
+                engine.candidates.apply_hint(hint)
+            hint = engine.request_hint()
+    while not engine.game_over:
+        engine.submit(pick_guess(engine, strategy, player_rng))
+    return hints
+
+
+def simulate_games(difficulty: int, strategy: str, answer_source: str, start: int, games: int, seed: int, use_hints: bool) -> dict:
+
+    """
+
+    this function plays games number start to start + games - 1 of a difficulty on a headless GameEngine (engine_class.py)
+    and returns their tallies: wins, a histogram of guesses used by the winning games (index = number of guesses) and
+    the number of hints requested. every game is derived from (seed, difficulty, game number) alone, so tasks can play
+    any shard of games in any process
+
+    Example Arg(s):
+        0, "consistent", "offline", 0, 2000, 7, False (int, str, str, int, int, int, bool)
+    Example Return:
+        {"difficulty": 0, "games": 2000, "wins": 1998, "guess_counts": [0, 0, 1, ...], "hints": 0} (dict)
+
+    """
+
+    get_engine(4 + difficulty, full_table=True)
+    engine = GameEngine(track_candidates=strategy != "random")
+    numpy_answers = make_numpy_answers(difficulty, start, games, seed) if answer_source == "numpy" else [None] * games
+    guess_counts = [0] * (MAX_GUESSES + 1)
+    wins = 0
+    hints = 0
+
+    for game, numpy_answer in zip(range(start, start + games), numpy_answers):
+        hints += play_game(engine, difficulty, strategy, answer_source, game, seed, use_hints, numpy_answer)
+        if engine.won:
+            wins += 1
+            guess_counts[len(engine.guess_history)] += 1
+
+    return {"difficulty": difficulty, "games": games, "wins": wins, "guess_counts": guess_counts, "hints": hints}
+
+
+def replay_game(difficulty: int, strategy: str, answer_source: str, game: int, seed: int, use_hints: bool) -> str:
+
+    """
+
+    this function replays one simulated game exactly (same --seed, --strategy, --answer-source and --use-hints as the
+    simulation it came from) and returns a transcript of it: answer, hints and every guess with its feedback
+
+    Example Arg(s):
+        0, "consistent", "offline", 12, 7, False (int, str, str, int, int, bool)
+    Example Return:
+        "hard game 12 (seed 7): answer 1234\n  1: 0000 -> (0, 0)\n ... won in 6 guesses" (str)
+
+    """
+
+    engine = GameEngine(track_candidates=strategy != "random")
+    numpy_answer = None
+    if answer_source == "numpy":
+        start = game - game % GAMES_PER_TASK
+        numpy_answer = make_numpy_answers(difficulty, start, game - start + 1, seed)[-1]
+    hints = play_game(engine, difficulty, strategy, answer_source, game, seed, use_hints, numpy_answer)
+
+    lines = [f"{DIFFICULTY_NAMES[difficulty]} game {game} (seed {seed}): answer {engine.ans}"]
+    lines.extend(f"  hint: {hint.description.strip()}" for hint in engine.hints[:hints])
+    lines.extend(f"  {turn + 1}: {guess} -> {score}" for turn, (guess, score) in enumerate(engine.guess_history))
+    lines.append(f"won in {len(engine.guess_history)} guesses" if engine.won else "lost")
+    return "\n".join(lines)
+
+
+def format_progress(totals: dict, target: int) -> str:
+
+    """
+
+    this function formats the running tallies of one difficulty as a single progress line
+
+    Example Arg(s):
+        {"difficulty": 0, "games": 4000, "wins": 3990, "guess_counts": [...], "hints": 0}, 10000 (dict, int)
+    Example Return:
+        "hard: 4000/10000 games, win rate 99.75%, avg guesses to win 5.62, hints/game 0.00" (str)
+
+    """
+
+    games = totals["games"]
+    wins = totals["wins"]
+    guesses = sum(count * used for used, count in enumerate(totals["guess_counts"]))
+    avg_guesses = guesses / wins if wins else 0.0
+    return (f"{DIFFICULTY_NAMES[totals['difficulty']]}: {games}/{target} games, win rate {100 * wins / games:.2f}%, "
+            f"avg guesses to win {avg_guesses:.2f}, hints/game {totals['hints'] / games:.2f}")
+
+
+def format_distribution(totals: dict) -> str:
+
+    """
+
+    this function formats the guess count distribution of one difficulty's winning games, plus its losses
+
+    Example Arg(s):
+        {"difficulty": 0, "games": 10000, "wins": 9990, "guess_counts": [...], "hints": 0} (dict)
+    Example Return:
+        "  1: 0.02%\\n  2: 0.51%\\n ...  lost: 0.10%" (str)
+
+    """
+
+    games = totals["games"]
+    lines = [f"  {used:>4}: {100 * count / games:6.2f}%" for used, count in enumerate(totals["guess_counts"]) if count]
+    lines.append(f"  lost: {100 * (games - totals['wins']) / games:6.2f}%")
+    return "\n".join(lines)
+
+
+def run_simulation(games: int, difficulties: list[int], strategy: str, answer_source: str, workers: int, seed: int, use_hints: bool) -> dict:
+
+    """
+
+    this function fans games out over a process pool in tasks of GAMES_PER_TASK games, prints a progress line
+    every time a task finishes and returns the final tallies per difficulty
+
+    Example Arg(s):
+        10000, [0, 1, 2], "entropy", "offline", 8, 0, False (int, list[int], str, str, int, int, bool)
+    Example Return:
+        {0: {...}, 1: {...}, 2: {...}} (dict)
+
+    """
+
+    totals = {difficulty: {"difficulty": difficulty, "games": 0, "wins": 0, "guess_counts": [0] * (MAX_GUESSES + 1), "hints": 0}
+              for difficulty in difficulties}
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for difficulty in difficulties:
+            for start in range(0, games, GAMES_PER_TASK):
+                futures.append(pool.submit(simulate_games, difficulty, strategy, answer_source, start, min(GAMES_PER_TASK, games - start), seed, use_hints))
+
+        for future in as_completed(futures):
+            result = future.result()
+            difficulty_totals = totals[result["difficulty"]]
+            for key in ("games", "wins", "hints"):
+                difficulty_totals[key] += result[key]
+            difficulty_totals["guess_counts"] = [a + b for a, b in zip(difficulty_totals["guess_counts"], result["guess_counts"])]
+            elapsed = time.perf_counter() - started
+            played = sum(t["games"] for t in totals.values())
+            sys.stdout.write(f"[{elapsed:7.1f}s {played / elapsed:9.0f} games/s] {format_progress(difficulty_totals, games)}\n")
+            sys.stdout.flush()
+
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="play many MASTERMIND games headlessly across every core and report win rates")
+    parser.add_argument("--games", type=int, default=10000, help="games to play per difficulty")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_NAMES.values()), action="append", help="difficulty to simulate (default: all)")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="consistent", help="how the simulated player picks its guesses")
+    parser.add_argument("--answer-source", choices=ANSWER_SOURCES, default="offline", help="where the answers come from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the answers and the player's choices")
+    parser.add_argument("--use-hints", action="store_true", help="request every hint at the start of each game")
+    parser.add_argument("--replay-game", type=int, metavar="GAME", help="replay game number GAME of each difficulty and print it instead of simulating")
+    args = parser.parse_args()
+
+    name_to_difficulty = {name: difficulty for difficulty, name in DIFFICULTY_NAMES.items()}
+    difficulties = sorted(name_to_difficulty[name] for name in args.difficulty) if args.difficulty else list(DIFFICULTY_NAMES)
+
+    if args.replay_game is not None:
+        for difficulty in difficulties:
+            sys.stdout.write(replay_game(difficulty, args.strategy, args.answer_source, args.replay_game, args.seed, args.use_hints) + "\n")
+        sys.exit(0)
+
+    totals = run_simulation(args.games, difficulties, args.strategy, args.answer_source, args.workers, args.seed, args.use_hints)
+
+    for difficulty in difficulties:
+        sys.stdout.write(f"\n{format_progress(totals[difficulty], args.games)}\nguesses used:\n{format_distribution(totals[difficulty])}\n")
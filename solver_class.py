@@ -0,0 +1,340 @@
+import time
+import numpy as np
+from collections import OrderedDict
+from candidates_class import CandidateSet
+from feedback_class import get_engine, score_pair, NUM_DIGIT_VALUES
+from opening_book import load_opening_book
+from engine_class import MAX_GUESSES
+
+#largest number of (guess, candidate) pairs a solver scores to pick one guess. Knuth's minimax scores every code in the
+#space against every candidate, which is fine for 8^4 codes but not for 8^5 or 8^6, so bigger problems shrink the guess pool
+MAX_PAIR_EVALUATIONS=4_000_000
+
+#number of (candidate set fingerprint, guess) -> partition histogram entries kept in each solver's LRU cache
+PARTITION_CACHE_SIZE=100_000
+
+#default wall clock budget (in seconds) EntropySolver spends picking one guess, keeps "hardest" under 50 ms per move
+ENTROPY_TIME_BUDGET=0.04
+
+#deterministic alternative to the wall clock budget: (guess, candidate) pairs EntropySolver scores per guess when given a
+#pair budget, roughly what ENTROPY_TIME_BUDGET buys. simulations use it so a game picks the same guesses under any load
+ENTROPY_PAIR_BUDGET=2**20
+
+#number of (guess, candidate) pairs EntropySolver scores between deadline checks, and the most guesses in one batch
+ENTROPY_BATCH_PAIRS=2**18
+ENTROPY_MAX_BATCH_GUESSES=1024
+
+
+def canonical_first_guesses(digit_count: int) -> np.ndarray:
+
+    """
+
+    this function returns one representative guess per digit pattern (0000, 0001, 0011, 0012, 0123 for 4 digits).
+    against the whole code space every guess with the same pattern splits the answers identically (the space is
+    symmetric under reordering positions and relabelling digits), so the first guess only needs these few candidates
+
+    Example Arg(s):
+        4 (int)
+    Example Return:
+        array([0, 1, 9, 10, 83], dtype=uint32) (np.ndarray)
+
+    """
+
+    def multiplicity_patterns(remaining: int, largest: int, parts: int):
+        if remaining == 0:
+            yield []
+            return
+        if parts == 0:
+            return
+        for part in range(min(remaining, largest), 0, -1):
+            for rest in multiplicity_patterns(remaining - part, part, parts - 1):
+                yield [part] + rest
+
+    guesses = []
+    for pattern in multiplicity_patterns(digit_count, digit_count, NUM_DIGIT_VALUES):
+        idx = 0
+        for digit, repeats in enumerate(pattern):
+            for _ in range(repeats):
+                idx = (idx << 3) | digit
+        guesses.append(idx)
+    return np.array(sorted(guesses), dtype=np.uint32)
+
+
+class Solver:
+
+    """
+
+    base class for solvers that play the Game code space for one digit count. a solver scores candidate guesses by
+    their feedback partition histograms (feedback_class.py) and plays the best one. histograms are cached per
+    (candidate set fingerprint, guess), so games and suggestion requests that reach the same candidate set reuse each
+    other's work. when the full guess pool would cost more than max_pair_evaluations scored pairs, the pool is narrowed
+    to the remaining candidates and then to a seeded sample of them. the first moves are read from the precomputed
+    opening book (opening_book.py) when it has an entry for the candidate set. subclasses define name and rank_guesses()
+
+    """
+
+    name: str = ""
+
+    def __init__(self, digit_count: int, max_pair_evaluations: int=MAX_PAIR_EVALUATIONS, cache_size: int=PARTITION_CACHE_SIZE, use_opening_book: bool=True):
+        self.digit_count: int = digit_count
+        self.engine = get_engine(digit_count, full_table=True)
+        self.max_pair_evaluations: int = max_pair_evaluations
+        self.cache_size: int = cache_size
+        self.partition_cache: OrderedDict = OrderedDict()
+        self.opening_book: dict[bytes, int] = load_opening_book().get(self.name, {}) if use_opening_book else {}
+
+    def guess_pool(self, candidates: CandidateSet) -> np.ndarray:
+
+        """
+
+        this function returns the guesses that will be scored for this turn: the canonical first guesses on the
+        untouched code space, every code when that fits in the pair budget, otherwise the candidates themselves,
+        sampled down (seeded by the candidate set fingerprint, so the choice is reproducible and cacheable) if needed
+
+        Example Arg(s):
+            <CandidateSet 312 candidates> (CandidateSet)
+        Example Return:
+            array([0, 1, 2, ...], dtype=uint32) (np.ndarray)
+
+        """
+
+        candidate_count = len(candidates)
+        if candidates.idxs is None:
+            return canonical_first_guesses(self.digit_count)
+        if self.engine.num_codes * candidate_count <= self.max_pair_evaluations:
+            return self.engine.code_idxs
+        candidate_idxs = candidates.as_array().astype(np.uint32)
+        pool_size = self.max_pair_evaluations // candidate_count
+        if pool_size >= candidate_count:
+            return candidate_idxs
+        rng = np.random.default_rng(int.from_bytes(candidates.fingerprint()[:8], "little"))
+        return np.sort(rng.choice(candidate_idxs, size=max(1, pool_size), replace=False))
+
+    def partitions(self, candidates: CandidateSet, guess_idxs: np.ndarray) -> np.ndarray:
+
+        """
+
+        this function returns the partition histograms of guess_idxs against the candidates, one row per guess.
+        histograms already in the cache for this candidate set are reused and only the missing guesses are scored.
+        a pool of every code (only chosen when the candidates are few enough to fit the pair budget) is scored in one
+        call and not cached: per guess bookkeeping would cost more than the scoring and flush the whole cache
+
+        Example Arg(s):
+            <CandidateSet 312 candidates>, np.array([0, 83]) (CandidateSet, np.ndarray)
+        Example Return:
+            array([[40, 0, ...], [12, 3, ...]]) (np.ndarray)
+
+        """
+
+        candidate_idxs = None if candidates.idxs is None else candidates.idxs.astype(np.uint32)
+        if len(guess_idxs) == self.engine.num_codes:
+            return self.engine.partition_counts_many(guess_idxs, candidate_idxs).astype(np.uint32)
+
+        fingerprint = candidates.fingerprint()
+        cache = self.partition_cache
+        rows = [cache.get((fingerprint, int(guess_idx))) for guess_idx in guess_idxs]
+        missing = []
+        for position, row in enumerate(rows):
+            if row is None:
+                missing.append(position)
+            else:
+                cache.move_to_end((fingerprint, int(guess_idxs[position])))
+
+        if missing:
+            computed = self.engine.partition_counts_many(guess_idxs[missing], candidate_idxs).astype(np.uint32)
+            for position, row in zip(missing, computed):
+                rows[position] = row
+                cache[(fingerprint, int(guess_idxs[position]))] = row
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+        return np.vstack(rows)
+
+    def rank_guesses(self, partitions: np.ndarray) -> np.ndarray:
+
+        """
+
+        this function scores every guess's partition histogram so that lower is better
+
+        Example Arg(s):
+            array([[40, 0, ...], [12, 3, ...]]) (np.ndarray)
+        Example Return:
+            array([40., 19.]) (np.ndarray)
+
+        """
+
+        raise NotImplementedError
+
+    def pick_best(self, candidates: CandidateSet, pool: np.ndarray, scores: np.ndarray) -> int:
+
+        """
+
+        this function returns the best scored guess of the pool. ties are broken in favour of guesses that are
+        still candidates (they can win this turn), then the lowest code index
+
+        Example Arg(s):
+            <CandidateSet 312 candidates>, np.array([0, 83]), np.array([40., 19.]) (CandidateSet, np.ndarray, np.ndarray)
+        Example Return:
+            83 (int)
+
+        """
+
+        could_win = np.isin(pool, candidates.as_array())
+        best = np.lexsort((pool, ~could_win, scores))[0]
+        return int(pool[best])
+
+    def next_guess(self, candidates: CandidateSet) -> int:
+
+        """
+
+        this function picks the index of the next guess to play for the candidate set: straight from the opening
+        book when the set has an entry, otherwise by searching for one with choose_guess()
+
+        Example Arg(s):
+            <CandidateSet 312 candidates> (CandidateSet)
+        Example Return:
+            1234 (int)
+
+        """
+
+        if len(candidates) <= 2:
+            return int(candidates.as_array()[0])
+
+        book_guess = self.opening_book.get(candidates.fingerprint())
+        if book_guess is not None:
+            return book_guess
+        return self.choose_guess(candidates)
+
+    def choose_guess(self, candidates: CandidateSet) -> int:
+
+        """
+
+        this function searches the guess pool for the best scored next guess for the candidate set
+
+        Example Arg(s):
+            <CandidateSet 312 candidates> (CandidateSet)
+        Example Return:
+            1234 (int)
+
+        """
+
+        pool = self.guess_pool(candidates)
+        return self.pick_best(candidates, pool, self.rank_guesses(self.partitions(candidates, pool)))
+
+    def solve(self, ans_idx: int, max_guesses: int=MAX_GUESSES) -> list[int]:
+
+        """
+
+        this function auto-plays a game against a known answer index and returns the guesses it made, in order.
+        the last guess is the answer unless the solver ran out of guesses
+
+        Example Arg(s):
+            1234, 10 (int, int)
+        Example Return:
+            [9, 1315, 1234] (list[int])
+
+        """
+
+        candidates = CandidateSet(self.digit_count)
+        guesses = []
+        while len(guesses) < max_guesses:
+            guess_idx = self.next_guess(candidates)
+            guesses.append(guess_idx)
+            if guess_idx == ans_idx:
+                break
+            candidates.update(guess_idx, score_pair(guess_idx, ans_idx, self.digit_count))
+        return guesses
+
+
+class MinimaxSolver(Solver):
+
+    """
+
+    Knuth's minimax strategy: every turn, play the guess whose worst case feedback leaves the fewest candidates
+
+    """
+
+    name: str = "minimax"
+
+    def rank_guesses(self, partitions: np.ndarray) -> np.ndarray:
+        return partitions.max(axis=1).astype(np.float64)
+
+
+class EntropySolver(Solver):
+
+    """
+
+    information theoretic strategy: every turn, play the guess whose feedback partition has the highest expected
+    entropy (the most information about the answer on average). picking a guess is limited to time_budget seconds of
+    wall clock: candidates are scored first, in a seeded random order, then random codes from the rest of the space,
+    in batches until the budget runs out, so big candidate sets are answered from a sample of the guess pool. with a
+    pair_budget instead, the search stops after that many (guess, candidate) pairs, so the same candidate set always
+    gets the same guess (simulations and their replays)
+
+    """
+
+    name: str = "entropy"
+
+    def __init__(self, digit_count: int, time_budget: float=ENTROPY_TIME_BUDGET, pair_budget: int | None=None, cache_size: int=PARTITION_CACHE_SIZE, use_opening_book: bool=True):
+        super().__init__(digit_count, cache_size=cache_size, use_opening_book=use_opening_book)
+        self.time_budget: float = time_budget
+        self.pair_budget: int | None = pair_budget
+
+    def rank_guesses(self, partitions: np.ndarray) -> np.ndarray:
+        totals = partitions.sum(axis=1, keepdims=True)
+        probabilities = partitions / totals
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.where(partitions > 0, probabilities * np.log2(probabilities), 0.0).sum(axis=1)
+        return -entropy
+
+    def choose_guess(self, candidates: CandidateSet) -> int:
+
+        """
+
+        this function searches for the next guess to play for the candidate set within the time budget. a new
+        batch is only started if the last one would still finish before the deadline (or, with a pair budget, once
+        fewer pairs than the budget have been scored), and at least one batch of guesses is always scored, so a tiny
+        budget degrades to a small sample instead of failing.
+        the search also stops once every candidate has been scored and one of them splits the candidates perfectly
+        (one candidate per feedback bucket), since no other guess can beat it
+
+        Example Arg(s):
+            <CandidateSet 312 candidates> (CandidateSet)
+        Example Return:
+            1234 (int)
+
+        """
+
+        if candidates.idxs is None:
+            return super().choose_guess(candidates)
+
+        deadline = time.perf_counter() + self.time_budget
+        candidate_idxs = candidates.as_array().astype(np.uint32)
+        rng = np.random.default_rng(int.from_bytes(candidates.fingerprint()[:8], "little"))
+        batch_size = min(ENTROPY_MAX_BATCH_GUESSES, max(1, ENTROPY_BATCH_PAIRS // len(candidate_idxs)))
+        shuffled_candidates = rng.permutation(candidate_idxs)
+        perfect_score = -np.log2(len(candidate_idxs))
+
+        pools, scores = [], []
+        evaluated = 0
+        batch_started = time.perf_counter()
+        while True:
+            if evaluated < len(shuffled_candidates):
+                batch = shuffled_candidates[evaluated:evaluated + batch_size]
+            else:
+                batch = rng.integers(0, self.engine.num_codes, size=batch_size, dtype=np.uint32)
+            evaluated += len(batch)
+            pools.append(batch)
+            scores.append(self.rank_guesses(self.partitions(candidates, batch)))
+            batch_finished = time.perf_counter()
+            if self.pair_budget is not None:
+                out_of_budget = evaluated * len(candidate_idxs) >= self.pair_budget
+            else:
+                out_of_budget = batch_finished + (batch_finished - batch_started) >= deadline
+            if out_of_budget or evaluated >= self.engine.num_codes:
+                break
+            batch_started = batch_finished
+            if evaluated >= len(shuffled_candidates) and min(score.min() for score in scores) <= perfect_score + 1e-9:
+                break
+
+        return self.pick_best(candidates, np.concatenate(pools), np.concatenate(scores))
@@ -0,0 +1,285 @@
+import os
+import sys
+import json
+import time
+import atexit
+
+#env variable that turns phase timing on: "1" prints the latency table to stderr on exit, any other value is a file
+#path the histograms are also written to as JSON
+TIMING_ENV_VAR="MASTERMIND_TIMING"
+
+#histogram resolution: every power of two of nanoseconds is split into this many buckets (about 19% wide each)
+SUB_BUCKET_BITS=2
+SUB_BUCKETS=1 << SUB_BUCKET_BITS
+
+#percentiles reported per phase
+PERCENTILES=[50, 90, 99]
+
+
+def process_age() -> float | None:
+
+    """
+
+    this function returns how many seconds ago the OS started this process (its start time in /proc/self/stat, in
+    clock ticks since boot, against the boot time clock), so interpreter start up and imports are included. the start
+    time has clock tick resolution (10 ms). returns None where /proc isn't available
+
+    Example Arg(s):
+        None
+    Example Return:
+        0.21 (float | None)
+
+    """
+
+    try:
+        with open("/proc/self/stat") as f:
+            stat = f.read()
+        start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def bucket_of(ns: int) -> int:
+
+    """
+
+    this function returns the log scale histogram bucket of a duration: its power of two (bit length) followed by
+    the SUB_BUCKET_BITS bits below the leading one
+
+    Example Arg(s):
+        1500 (int)
+    Example Return:
+        45 (int)
+
+    """
+
+    bits = ns.bit_length()
+    if bits <= SUB_BUCKET_BITS:
+        return ns
+    return (bits << SUB_BUCKET_BITS) | ((ns >> (bits - 1 - SUB_BUCKET_BITS)) & (SUB_BUCKETS - 1))
+
+
+def bucket_floor(bucket: int) -> int:
+
+    """
+
+    this function returns the smallest duration (ns) that falls into a histogram bucket, the inverse of bucket_of()
+
+    Example Arg(s):
+        45 (int)
+    Example Return:
+        1280 (int)
+
+    """
+
+    bits = bucket >> SUB_BUCKET_BITS
+    if bits <= SUB_BUCKET_BITS:
+        return bucket
+    return (SUB_BUCKETS | (bucket & (SUB_BUCKETS - 1))) << (bits - 1 - SUB_BUCKET_BITS)
+
+
+class PhaseTimer:
+
+    """
+
+    in process latency histograms of named phases. phases nest, and each one records its exclusive time: while an
+    inner phase (e.g. waiting for input while re-prompting inside validate_guess) runs, the outer phase's clock is
+    paused, so think time and processing time never count twice
+
+    """
+
+    def __init__(self):
+        self.histograms: dict[str, dict[int, int]] = {}
+        self.totals: dict[str, list[int]] = {}
+        self.stack: list[list] = []
+
+    def start(self, name: str) -> None:
+        now = time.perf_counter_ns()
+        if self.stack:
+            outer = self.stack[-1]
+            outer[2] += now - outer[1]
+        self.stack.append([name, now, 0])
+
+    def stop(self) -> None:
+        now = time.perf_counter_ns()
+        name, started, elapsed = self.stack.pop()
+        self.record(name, elapsed + now - started)
+        if self.stack:
+            self.stack[-1][1] = now
+
+    def record(self, name: str, ns: int) -> None:
+
+        """
+
+        this function adds one duration (ns) to a phase's histogram and its count / total / max
+
+        Example Arg(s):
+            "validate_guess", 1500 (str, int)
+        Example Return:
+            None
+
+        """
+
+        histogram = self.histograms.setdefault(name, {})
+        bucket = bucket_of(ns)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        totals = self.totals.setdefault(name, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += ns
+        totals[2] = max(totals[2], ns)
+
+    def percentile(self, name: str, percent: float) -> int:
+
+        """
+
+        this function estimates a percentile of a phase's durations (ns) from its histogram, as the floor of the
+        bucket the percentile falls into
+
+        Example Arg(s):
+            "validate_guess", 99 (str, float)
+        Example Return:
+            3584 (int)
+
+        """
+
+        histogram = self.histograms[name]
+        rank = percent / 100 * self.totals[name][0]
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= rank:
+                return bucket_floor(bucket)
+        return self.totals[name][2]
+
+    def summary(self) -> dict:
+
+        """
+
+        this function returns every phase's count, total, mean, max and percentiles (ns) plus its raw histogram
+        ({bucket floor ns: count})
+
+        Example Arg(s):
+            None
+        Example Return:
+            {"validate_guess": {"count": 120, "total_ns": 240000, "mean_ns": 2000, "max_ns": 9000, "p50_ns": 1792, ...}} (dict)
+
+        """
+
+        summary = {}
+        for name, (count, total, longest) in self.totals.items():
+            phase = {"count": count, "total_ns": total, "mean_ns": total // count, "max_ns": longest}
+            for percent in PERCENTILES:
+                phase[f"p{percent}_ns"] = self.percentile(name, percent)
+            phase["histogram"] = {bucket_floor(bucket): hits for bucket, hits in sorted(self.histograms[name].items())}
+            summary[name] = phase
+        return summary
+
+    def format_table(self) -> str:
+
+        """
+
+        this function formats the summary as a table, one phase per row, sorted by total time
+
+        Example Arg(s):
+            None
+        Example Return:
+            "phase   count   total ms   mean us ...\\nvalidate_guess   120   0.24   2.0 ..." (str)
+
+        """
+
+        summary = self.summary()
+        header = f"{'phase':<24}{'count':>9}{'total ms':>12}{'mean us':>11}" + "".join(f"{f'p{p} us':>11}" for p in PERCENTILES) + f"{'max us':>11}"
+        rows = [header]
+        for name, phase in sorted(summary.items(), key=lambda item: -item[1]["total_ns"]):
+            rows.append(f"{name:<24}{phase['count']:>9}{phase['total_ns'] / 1e6:>12.2f}{phase['mean_ns'] / 1e3:>11.1f}"
+                        + "".join(f"{phase[f'p{p}_ns'] / 1e3:>11.1f}" for p in PERCENTILES) + f"{phase['max_ns'] / 1e3:>11.1f}")
+        return "\n".join(rows)
+
+    def dump(self, destination: str) -> None:
+
+        """
+
+        this function reports the histograms at exit: the table to stderr, plus the summary as JSON when destination
+        is a file path (anything other than "1")
+
+        Example Arg(s):
+            "timing.json" (str)
+        Example Return:
+            None
+
+        """
+
+        if not self.totals:
+            return
+        sys.stderr.write(f"\nphase timings (exclusive):\n{self.format_table()}\n")
+        if destination != "1":
+            with open(destination, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+
+
+class Phase:
+
+    """
+
+    context manager that times the code inside it as one occurrence of a named phase on a PhaseTimer
+
+    """
+
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer: PhaseTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer.start(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.stop()
+        return False
+
+
+class NullPhase:
+
+    """
+
+    context manager that does nothing, returned by phase() while timing is off so instrumented code costs next to nothing
+
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE=NullPhase()
+
+#process wide timer, created at import when TIMING_ENV_VAR is set (and dumped at exit), otherwise None
+PHASE_TIMER: PhaseTimer | None = None
+if os.environ.get(TIMING_ENV_VAR, "") not in ["", "0"]:
+    PHASE_TIMER = PhaseTimer()
+    atexit.register(PHASE_TIMER.dump, os.environ[TIMING_ENV_VAR])
+
+
+def phase(name: str) -> Phase | NullPhase:
+
+    """
+
+    this function returns the context manager that times one occurrence of a phase, or NULL_PHASE when timing is off
+
+    Example Arg(s):
+        "validate_guess" (str)
+    Example Return:
+        <Phase validate_guess> (Phase | NullPhase)
+
+    """
+
+    if PHASE_TIMER is None:
+        return NULL_PHASE
+    return Phase(PHASE_TIMER, name)
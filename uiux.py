@@ -33,4 +33,7 @@ LOSE_MSG="""
 """
 
 
-LINE="\r---------------------------------------------------------------------------------------------------------------------------------"
\ No newline at end of file
+LINE="\r---------------------------------------------------------------------------------------------------------------------------------"
+
+#ANSI escape sequence that clears the terminal and moves the cursor home, used instead of os.system("clear") in fast start mode
+CLEAR_SCREEN="\033[2J\033[H"